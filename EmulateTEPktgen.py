@@ -26,8 +26,11 @@ Usage:
 """
 
 import os
+import glob
 import time
+import tempfile
 import subprocess
+import multiprocessing
 import shutil
 import importlib
 import traceback
@@ -61,6 +64,10 @@ from EmulateTE import validate_scenario
 # in the list (index 1). All other attributes of the command are ignored!
 CONTROLLERS = {}
 
+# Prefix of the generated Pktgen scripts. Every re-start writes a new uniquely
+# named script so a running bash instance never sees its script change.
+PKTGEN_SCRIPT_PREFIX = "pktgen_"
+
 # Template for the Pktgen script used to generate traffic
 PKTGEN_SCRIPT_TMPL = """#!/bin/bash
 
@@ -81,11 +88,7 @@ function pgset() {{
 # Load the pktgen module
 modprobe pktgen
 
-# Clear all configured devices
-for ((processor=0;processor<$CPUS;processor++)) do
-    PGDEV=/proc/net/pktgen/kpktgend_$processor
-    pgset "rem_device_all"
-done
+{clear_block}
 
 {conf_block}
 
@@ -93,11 +96,26 @@ done
 PGDEV=/proc/net/pktgen/pgctrl pgset "start"
 """
 
+# Template that clears the devices of all pktgen threads (used on first start)
+PKTGEN_CLEAR_ALL_TMPL = """# Clear all configured devices
+for ((processor=0;processor<$CPUS;processor++)) do
+    PGDEV=/proc/net/pktgen/kpktgend_$processor
+    pgset "rem_device_all"
+done
+"""
+
+# Template that clears the devices of a single pktgen thread. Pktgen can't
+# remove individual devices so a thread is cleared when one of its streams end.
+PKTGEN_CLEAR_TMPL = """PGDEV=/proc/net/pktgen/kpktgend_{cpu}
+pgset "rem_device_all"
+"""
+
 # Template for a Pktgen stream that intiates sending traffic to
-# a particular destination with a specific rate.
-PKTGEN_STREAM_TMPL = """PGDEV=/proc/net/pktgen/kpktgend_0
-pgset 'add_device {eth_device}@0'
-PGDEV=/proc/net/pktgen/{eth_device}@0
+# a particular destination with a specific rate. Streams are bound to the
+# pktgen kernel thread of CPU '{cpu}' to spread the load across all cores.
+PKTGEN_STREAM_TMPL = """PGDEV=/proc/net/pktgen/kpktgend_{cpu}
+pgset 'add_device {eth_device}@{cpu}'
+PGDEV=/proc/net/pktgen/{eth_device}@{cpu}
 
 pgset 'count 0'
 pgset 'flag QUEUE_MAP_CPU'
@@ -137,6 +155,9 @@ topo = None
 controller = None
 # Running network instance
 net = None
+# Cached host attributes of the running network in format (host node,
+# interface, advertise host name)
+hosts_attr = None
 
 
 def cleanup():
@@ -154,8 +175,7 @@ def cleanup():
 
     if net is not None:
         # Stop the LLDP packet generators
-        for h in topo.hosts_attr(net):
-            host = net.get(h[0])
+        for host, intf, name in hosts_attr or []:
             signal_subprocess(host, "LLDP/lldp_host.py", kill=True)
 
         # Stop the TE packet performance loggers (receivers)
@@ -167,8 +187,10 @@ def cleanup():
             signal_subprocess(host, "TEPerformanceLogger/logger")
 
         # Stop the pktgen script, cleanup and stop the network
-        signal_local_subprocess("bash pktgen_run.sh", kill=True)
-        clean_out = subprocess.check_output("bash pktrem.sh", shell=True)
+        signal_local_subprocess("bash %s" % PKTGEN_SCRIPT_PREFIX, kill=True)
+        clean_out = subprocess.check_output(["bash", "pktrem.sh"])
+        for path in glob.glob("%s*.sh" % PKTGEN_SCRIPT_PREFIX):
+            os.remove(path)
         net.stop()
         net = None
 
@@ -197,9 +219,8 @@ def run(controller_name):
     """
     # Tell the hosts to start generating LLDP packets
     time.sleep(1)
-    for h in topo.hosts_attr(net):
-        host = net.get(h[0])
-        host.cmd("LLDP/lldp_host.py %s %s &" % (h[1], h[2]))
+    for host, intf, name in hosts_attr:
+        host.cmd("LLDP/lldp_host.py %s %s &" % (intf, name))
 
     # Wait for the switches to start-up with the correct state
     try:
@@ -212,11 +233,11 @@ def run(controller_name):
     except StateWaitTimeoutException:
         # If we time out write an error message, dump the flows and clean-up
         print("ERROR!,Network state took too long to stabilise, exiting ...")
-        ls.critical("%s\n" % subprocess.check_output(["ps", "-aux"]))
+        lg.critical("%s\n" % subprocess.check_output(["ps", "-aux"]))
 
         # Dump the flow rules (and groups if not reactive controller)
         dump_groups = False
-        if controller_name is not "reactive":
+        if controller_name != "reactive":
             dump_groups = True
         topo.dump_tables(dump_groups=dump_groups)
 
@@ -233,52 +254,75 @@ def run(controller_name):
         host.cmd("TEPerformanceLogger/logger int:%s-eth0 pcap:%s.pcap &"
                     % (r["host"], i))
 
-    # Construct a timeline for test based on sender and stream info
+    # Construct a timeline for test based on sender and stream info. The send
+    # table is split into parallel lists and the streams are indexed by the
+    # time they start and end at so each tick only looks at changed streams.
+    sends = SCENARIO["scenario"]["send"]
+    stream_time = SCENARIO["scenario"]["stream_time"]
+    src_hosts = [s["src_host"] for s in sends]
+    rates = [s["rate"] for s in sends]
+    dest_addrs = [s["dest_addr"] for s in sends]
+    start_events = {}
+    end_events = {}
+    for i in range(len(sends)):
+        start_at = sends[i]["delay"] + 1
+        start_events.setdefault(start_at, []).append(i)
+        end_events.setdefault(start_at + stream_time, []).append(i)
+    finish_at = max(end_events) if end_events else 0
+
     timed_out = True
     active_streams = []
+    configured_streams = None
     for wait in range(120):
-        all_done = True
+        all_done = wait >= finish_at
         restart_streams = False
-        for i in range(len(SCENARIO["scenario"]["send"])):
-            s = SCENARIO["scenario"]["send"][i]
-            start_at = s["delay"] + 1
-            end_at = s["delay"] + 1 + SCENARIO["scenario"]["stream_time"]
-            if start_at == wait:
-                # Start the stream sending
-                info("Adding stream %s at time %s\n" % (s["src_host"], wait))
-                active_streams.append(i)
-                all_done = False
-
-                # Restart the streams
-                restart_streams = True
-            elif end_at > wait:
-                # This stream has not finished so keep running
-                all_done = False
-            elif end_at == wait:
-                info("Ending sender %s at time %s\n" % (s["src_host"], wait))
-                active_streams.remove(i)
-                restart_streams = True
+        for i in start_events.get(wait, []):
+            # Start the stream sending
+            info("Adding stream %s at time %s\n" % (src_hosts[i], wait))
+            active_streams.append(i)
+            restart_streams = True
+        for i in end_events.get(wait, []):
+            info("Ending sender %s at time %s\n" % (src_hosts[i], wait))
+            active_streams.remove(i)
+            restart_streams = True
 
         # If we ened to re-start pktgen
         if restart_streams:
-            signal_local_subprocess("bash pktgen_run.sh", kill=True)
-
-            with open("pktgen_run.sh", "w") as f:
+            signal_local_subprocess("bash %s" % PKTGEN_SCRIPT_PREFIX,
+                                    kill=True)
+
+            # Only clear and re-add the streams of pktgen threads that changed
+            cpus = multiprocessing.cpu_count()
+            if configured_streams is None:
+                clear_str = PKTGEN_CLEAR_ALL_TMPL
+                add_streams = active_streams
+            else:
+                clear_cpus = set([i % cpus for i in
+                        configured_streams.difference(active_streams)])
+                clear_str = "".join([PKTGEN_CLEAR_TMPL.format(cpu=cpu)
+                        for cpu in sorted(clear_cpus)])
+                add_streams = [i for i in active_streams
+                        if i not in configured_streams or
+                            i % cpus in clear_cpus]
+            configured_streams = set(active_streams)
+
+            with tempfile.NamedTemporaryFile("w", delete=False, dir=".",
+                    prefix=PKTGEN_SCRIPT_PREFIX, suffix=".sh") as f:
                 cmd_str = ""
-                for i in active_streams:
-                    s = SCENARIO["scenario"]["send"][i]
-                    eth_device = "%s-eth0" % s["src_host"]
-                    packet_rate = s["rate"]
-                    dest_ip = s["dest_addr"]
+                for i in add_streams:
+                    eth_device = "%s-eth0" % src_hosts[i]
                     cmd_str += "\n%s\n" % (PKTGEN_STREAM_TMPL.format(
+                                            cpu=i % cpus,
                                             eth_device=eth_device,
-                                            packet_rate=packet_rate,
-                                            dest_ip=dest_ip))
-                f.write(PKTGEN_SCRIPT_TMPL.format(conf_block=cmd_str))
+                                            packet_rate=rates[i],
+                                            dest_ip=dest_addrs[i]))
+                f.write(PKTGEN_SCRIPT_TMPL.format(clear_block=clear_str,
+                                                  conf_block=cmd_str))
+                script_path = os.path.relpath(f.name)
 
             # Start the newly created script
             info("Re-starting pktgen scripts at time %s\n" % wait)
-            subprocess.call("bash pktgen_run.sh &", shell=True)
+            subprocess.Popen(["bash", script_path])
             info("\tDone\n")
 
         if all_done:
@@ -294,7 +338,8 @@ def run(controller_name):
 
     # Cleanup, process results and remove temp files
     cleanup()
-    os.remove("logger.done")
+    if os.path.isfile("logger.done"):
+        os.remove("logger.done")
     for i in range(len(SCENARIO["scenario"]["receive"])):
         try:
             proc_pktgen_data(i)
@@ -304,8 +349,6 @@ def run(controller_name):
                             % (i, ex))
             continue
 
-    os.remove("pktgen_run.sh")
-
 def proc_pktgen_data(server_index):
     """ Process the pktgen data of a specific sender and generate a result file.
 
@@ -401,6 +444,8 @@ if __name__ == "__main__":
         controllers.set_ctrl_cmd_module(get_ctrl_module(CONTROLLERS,
                                             controller_name))
         net = controllers.start(topo)
+        hosts_attr = [(net.get(h[0]), h[1], h[2])
+                        for h in topo.hosts_attr(net)]
         run(controller_name)
     except:
         # Show the erro, cleanup and exit the app
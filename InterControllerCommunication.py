@@ -6,9 +6,16 @@ other controllers and allows inter-controller communications.
 
 from ryu.lib import hub
 import pika
-import pickle
 import random
-from threading import Timer, Lock
+import time
+import logging
+from threading import Lock
+
+# Use the C pickle implementation if available (Python 2)
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 
 
 # --- Module to perform local leader election
@@ -24,22 +31,61 @@ class ControllerCommunication:
         EXCHANGE_TYPE (str): Type of the exchange (direct)
         KEEP_ALIVE (int): Number of seconds of inactivity to trigger ctrl
             keep alive (send controller ID).
+        PREFETCH (int): Maximum number of unacknowledged messages the broker
+            will push to the receive channel.
+        ACK_BATCH (int): Number of received messages to acknowledge at once
+        ACK_FLUSH_TIME (float): Maximum number of seconds to wait before
+            acknowledging a partial batch of received messages.
+        TRAFFIC_BATCH_TIME (float): Number of seconds to coalesce inter-domain
+            link traffic reports for before sending them as a single message.
+        STOP_TIMEOUT (float): Maximum number of seconds to wait for the threads to
+            finish when stopping the module.
         *_RK (str): Routing keys used to send information
+        SEND_CLASS (dict): Send connection class of each routing key. Routing keys
+            not in the dictionary use the 'topo' class.
 
     Attr:
         logger (obj): Logger instance used to output debug information
         app (obj): Controller instance that initiated the inter controller communication obj
         thread (ryu.lib.hub): Greenleat object instance (thread)
-        con_send (obj): RabbitMQ send connection instance
+        con_send (dict): RabbitMQ send connection instance of each send class
         con_recv (obj): RabbitMQ receive connection instance
-        chn_send (obj): RabbitMQ send channel instance
+        chn_send (dict): RabbitMQ send channel instance of each send class
         chn_recv (obj): rabbitMQ recieve channel instance
         cid (int): ID of the controller
-        send_lock (threading.Lock): Send channel lock used to make operation thread safe
+        cid_rk (str): Routing key of messages sent to this controller
+        send_lock (dict): Send channel lock (threading.Lock) of each send class used to
+            make operation thread safe
         inter_dom_paths (dict): Old path computation request received from the root
             controller to install inter-domain paths.
+        inter_dom_index (dict): Index of the paths in `inter_dom_paths` by egress and
+            ingress in format {<hkey>: ({<out>: <path>}, {<in>: <path>})}.
         leader_elect (obj): Instance to the leader election module
         leader_elect_worker (ryu.lib.hub): Leader election role change worker thread
+        keep_alive_worker (ryu.lib.hub): Keep alive worker thread that sends the CID
+            after `KEEP_ALIVE` seconds of inactivity.
+        traffic_worker (ryu.lib.hub): Worker thread that sends the pending
+            inter-domain link traffic reports after `TRAFFIC_BATCH_TIME`.
+        _unacked (int): Number of received messages not yet acknowledged
+        _last_delivery_tag (int): Delivery tag of the last received message
+        _ack_flush_timer (obj): Receive connection timer that acknowledges a
+            partial batch of messages.
+        _cid_payload (str): Cached pickled CID keep alive message
+        _cid_payload_thresh (float): TE utilisation threshold of `_cid_payload`
+        _last_send_ts (float): Time data was last sent to the root controller. None if
+            the keep alive is stopped.
+        _is_master_cached (bool): Cached master role of the instance, updated by
+            `role_change_work` on promotion or demotion.
+        _topo_cache (tuple): Switches and host info sent in the last topology message and
+            the topology version and hosts they were computed for, in format
+            ((<topo_version>, <hosts>), <switches>, <host_info>).
+        _pending_traffic (dict): Latest inter-domain link traffic (bps) not yet sent to
+            the root controller in format {(<sw>, <port>): <traff_bps>}.
+        _handlers (dict): Method that processes each received message type (key 'msg')
+        _publish (dict): Bound publish method of the `:cls:attr:(chn_send)` channel of
+            each send class.
+        _transient_props (pika.BasicProperties): Shared properties of published messages
+            (non-persistent delivery mode).
     """
 
 
@@ -47,6 +93,11 @@ class ControllerCommunication:
     EXCHANGE = "SDN_Bridge"
     EXCHANGE_TYPE = "topic"
     KEEP_ALIVE = 4
+    PREFETCH = 64
+    ACK_BATCH = 32
+    ACK_FLUSH_TIME = 0.2
+    TRAFFIC_BATCH_TIME = 0.2
+    STOP_TIMEOUT = 2.0
 
     # --- Routing keys used to send comments using RabbitMq ---
 
@@ -69,6 +120,20 @@ class ControllerCommunication:
 
     # ----------------------------------------------------------
 
+    # Every send class publishes on a seperate connection and channel so a large
+    # topology message does not delay keep alives and link traffic notifications.
+    # The keep alive worker services the idle connections (`_service_send_cons`).
+    SEND_CLASS = {
+        DISCOVER_RK: "discover",
+        TOPO_RK: "topo",
+        UNKNOWN_SW_RK: "inter_domain",
+        DEAD_PORT_RK: "inter_domain",
+        INTER_LINK_TRAFFIC_RK: "inter_domain",
+        INTER_LINK_CONGESTION_RK: "inter_domain",
+        INTER_LINK_EGRESS_CHANGE_RK: "inter_domain",
+        INTER_LINK_INGRESS_CHANGE_RK: "inter_domain",
+    }
+
 
     def __init__(self, logger, app, dom_id=1):
         """ Intiate a new controller com instance and bind the app and loger objects
@@ -81,25 +146,55 @@ class ControllerCommunication:
         self.thread = None
         self.logger = logger
 
-        self.con_send = None
+        self.con_send = {}
         self.con_recv = None
-        self.chn_send = None
+        self.chn_send = {}
         self.chn_recv = None
+        self._publish = {}
+        self._transient_props = pika.BasicProperties(delivery_mode=1)
 
         self.app = app
-        self.keep_alive_timer = None
+        self.keep_alive_worker = None
+        self._last_send_ts = None
+        self.traffic_worker = None
+        self._pending_traffic = {}
+        self._topo_cache = None
 
         self.leader_elect_worker = None
         self.leader_elect = None
+        self._is_master_cached = False
 
         # Save the provided domain_id
         # TODO: FIXME, maybe add a d or something to it. Issues appear when the CID is the same
         # as a switch on the root controller.
         self.cid = int("100%d" % dom_id)
+        self.cid_rk = "c.%d" % self.cid
 
-        # Initiate the send lock and the inter domain path instructions dictionary
-        self.send_lock = Lock()
+        # Initiate the send locks and the inter domain path instructions dictionary
+        self.send_lock = {}
+        for send_cls in set(self.SEND_CLASS.values()):
+            self.send_lock[send_cls] = Lock()
         self.inter_dom_paths = {}
+        self.inter_dom_index = {}
+
+        # Batch acknowledgement state of the receive channel
+        self._unacked = 0
+        self._last_delivery_tag = None
+        self._ack_flush_timer = None
+
+        # Cached CID keep alive payload (only changes with the TE threshold)
+        self._cid_payload = None
+        self._cid_payload_thresh = None
+
+        # Handler of each received message type (key 'msg')
+        self._handlers = {
+            "get_topo": self._action_get_topo,
+            "get_id": self._action_get_id,
+            "unknown_sw": self._action_unknown_sw,
+            "compute_paths": self._action_compute_paths,
+            "ctrl_dead": self._action_ctrl_dead,
+            "processed_con": self._action_processed_con,
+        }
 
 
     # -------------- THREAD METHODS -------------
@@ -126,19 +221,28 @@ class ControllerCommunication:
 
     def stop(self):
         """ Stop the threads and cancel any keep alive timers. """
-        # Stop the keep alive timer
+        # Stop the keep alive timer and discard any pending traffic reports
         self.stop_keep_alive_timer()
+        if self.traffic_worker is not None:
+            hub.kill(self.traffic_worker)
+            self.traffic_worker = None
+        self._pending_traffic = {}
+        self._topo_cache = None
 
         if self.is_active():
             # Stop the leader election instance
             self.leader_elect.stop()
 
-            # Kill the hub threads
-            hub.kill(self.thread)
-            hub.kill(self.leader_elect_worker)
-            hub.joinall([self.thread, self.leader_elect_worker])
+            # Kill the hub threads that are still running (the role change worker exits
+            # when leader election stops) and bound the wait if the broker is unreachable
+            threads = [self.thread, self.leader_elect_worker]
+            for t in threads:
+                if not t.dead:
+                    hub.kill(t)
+            with hub.Timeout(self.STOP_TIMEOUT, False):
+                hub.joinall(threads)
             self.thread = None
-            self.leader_elect_thread = None
+            self.leader_elect_worker = None
 
 
     def __call__(self):
@@ -146,20 +250,23 @@ class ControllerCommunication:
         one for reciving. Consume messages from the communication chanell and bind handler
         for recived messages.
         """
-        # Initiate two rabbitMQ connections, one for sending and one for reciving
-        self.con_send, self.chn_send = self._init_rabbitmq_con()
+        # Initiate the rabbitMQ connections, one for every send class and one for reciving
+        for send_cls in self.send_lock:
+            self.con_send[send_cls], self.chn_send[send_cls] = self._init_rabbitmq_con()
+            self._publish[send_cls] = self.chn_send[send_cls].basic_publish
         self.con_recv, self.chn_recv = self._init_rabbitmq_con()
 
         # Register for messages on the sending connection
         res = self.chn_recv.queue_declare("", exclusive=True)
         queue_name = res.method.queue
-        self.logger.info("CID:%d" % self.cid)
-        self.chn_recv.queue_bind(exchange=self.EXCHANGE, queue=queue_name, routing_key="c.%d" % self.cid)
+        self.logger.info("CID:%d", self.cid)
+        self.chn_recv.queue_bind(exchange=self.EXCHANGE, queue=queue_name, routing_key=self.cid_rk)
         self.chn_recv.queue_bind(exchange=self.EXCHANGE, queue=queue_name, routing_key="c.all")
 
         # Start reciving inter-ctrl messages
         self.logger.info("Initiated controller RabbitMQ connections, chanel and exchanges")
-        self.chn_recv.basic_consume(queue=queue_name, on_message_callback=self.on_receive, auto_ack=True)
+        self.chn_recv.basic_qos(prefetch_count=self.PREFETCH)
+        self.chn_recv.basic_consume(queue=queue_name, on_message_callback=self.on_receive, auto_ack=False)
         self.chn_recv.start_consuming()
 
 
@@ -177,16 +284,21 @@ class ControllerCommunication:
         (```ctrl_role_change_event``` from `:cls:attr:(leader_elect)` set)
         call the app promote/demote role method (`:cls:attr:(app)`). If the
         role is 'master', send an early domain keep alive to prevent the root
-        from timing out the area due to instance failures.
+        from timing out the area due to instance failures. The worker exits
+        when the leader election module is stopped (sets the event).
         """
         while self.leader_elect.is_active():
-            self.leader_elect.ctrl_role_change_event.wait(1)
+            self.leader_elect.ctrl_role_change_event.wait()
+            if not self.leader_elect.is_active():
+                break
+
             if self.leader_elect.ctrl_role_change_event.is_set():
                 self.leader_elect.ctrl_role_change_event.clear()
 
                 # Get the ctrl role and update it
                 role = self.get_ctrl_role()
-                self.logger.info("Received controller role %s" % role)
+                self._is_master_cached = role == "master"
+                self.logger.info("Received controller role %s", role)
                 if role == "slave":
                     self.app.demote_slave()
 
@@ -250,45 +362,116 @@ class ControllerCommunication:
         """
         self.logger.info("Closing RabbitMQ chanel and connection")
 
-        if self.chn_send is not None:
-            self.chn_send.close()
+        for chn in self.chn_send.values():
+            chn.close()
         if self.chn_recv is not None:
             self.chn_recv.close()
 
-        if self.con_send is not None:
-            self.con_send.close()
+        for con in self.con_send.values():
+            con.close()
         if self.con_recv is not None:
             self.con_recv.close()
 
+        # Release the connection objects (sockets and buffers)
+        self.con_send = {}
+        self.chn_send = {}
+        self._publish = {}
+        self.con_recv = None
+        self.chn_recv = None
+
+
+    def _flush_acks(self):
+        """ Acknowledge all outstanding received messages with a single multiple ack
+        and cancel the partial batch flush timer.
+        """
+        if self._ack_flush_timer is not None:
+            self.con_recv.remove_timeout(self._ack_flush_timer)
+            self._ack_flush_timer = None
+
+        if self._unacked > 0:
+            self.chn_recv.basic_ack(delivery_tag=self._last_delivery_tag, multiple=True)
+            self._unacked = 0
+
+
+    def _ack_flush_timer_work(self):
+        """ Callback executed on partial batch flush timer trigger """
+        self._ack_flush_timer = None
+        self._flush_acks()
+
 
     def pika_safe_send(self, routing_key, data):
-        """ perform a thread safe send command on `:cls:attr:(chn_send)` using the routing key
-        `routing_key` and sending string `data`. Method will try to aquire a lock `:cls:attr:(send_lock)`
-        before sending data. If a pika exception occurs when sending, the method will try to re-start the
-        chanel instance and re-call the send method.
+        """ perform a thread safe send command on the `:cls:attr:(chn_send)` of the send class of
+        `routing_key` (`:cls:attr:(SEND_CLASS)`), sending string `data`. Method will try to aquire the
+        send class lock `:cls:attr:(send_lock)` before sending data. If the connection or channel
+        fails when sending, the method will try to re-start the chanel instance and re-call the send
+        method. Any other pika exception is logged and the message is dropped.
+
+        Publisher confirms are not enabled on the send channels. With a BlockingConnection every
+        confirmed publish waits for the broker ack while holding the send lock, turning each send
+        into a synchronous round trip.
 
         Args:
             routing_key (str): Routing key to use for sending data
             data (str): Data to send
         """
-        if not self.is_master():
-            self.logger.debug("Stopping message as we are not master (%s)" % routing_key)
+        if not self._is_master_cached:
+            self.logger.debug("Stopping message as we are not master (%s)", routing_key)
             return
 
+        send_cls = self.SEND_CLASS.get(routing_key, "topo")
         try:
-            with self.send_lock:
-                self.chn_send.basic_publish(exchange=self.EXCHANGE, routing_key=routing_key, body=data)
-        except pika.exceptions.AMQPError:
+            with self.send_lock[send_cls]:
+                self._publish[send_cls](exchange=self.EXCHANGE, routing_key=routing_key,
+                                        body=data, properties=self._transient_props)
+        except (pika.exceptions.AMQPConnectionError, pika.exceptions.ChannelClosed):
             self.logger.error("---Exception while sending message, restartin chanel and trying again")
 
             # Restart the send channel and connection
-            if self.chn_send is not None and self.chn_send.is_open:
-                self.chn_send.close()
-            if self.con_send is not None and self.con_send.is_open:
-                self.con_send.close()
-
-            self.con_send, self.chn_send = self._init_rabbitmq_con()
+            chn = self.chn_send.get(send_cls)
+            con = self.con_send.get(send_cls)
+            if chn is not None and chn.is_open:
+                chn.close()
+            if con is not None and con.is_open:
+                con.close()
+
+            self.con_send[send_cls], self.chn_send[send_cls] = self._init_rabbitmq_con()
+            self._publish[send_cls] = self.chn_send[send_cls].basic_publish
             self.pika_safe_send(routing_key, data)
+        except pika.exceptions.AMQPError:
+            self.logger.exception("---Failed to send message (%s)", routing_key)
+
+
+    def _service_send_cons(self):
+        """ Process the pending I/O events of every send connection under the send class
+        lock. A BlockingConnection only sends and checks heartbeats while doing I/O, so a
+        send class that publishes rarely (i.e. topology or inter-domain) would otherwise be
+        dropped by the broker. A failed connection is re-started by the next send.
+        """
+        for send_cls, con in self.con_send.items():
+            try:
+                with self.send_lock[send_cls]:
+                    if con.is_open:
+                        con.process_data_events(0)
+            except pika.exceptions.AMQPConnectionError:
+                self.logger.debug("Send connection %s lost while idle", send_cls)
+
+
+    def _unindex_unknown_link(self, key):
+        """ Remove an unknown link from the CID reverse index of the app
+        (`unknown_links_by_cid`). Unresolved links (no CID) are not indexed.
+
+        Args:
+            key (triple): Unknown link key to remove from the index
+        """
+        cid = self.app.unknown_links.get(key)
+        if cid is None or isinstance(cid, list):
+            return
+
+        keys = self.app.unknown_links_by_cid.get(cid)
+        if keys is not None:
+            keys.discard(key)
+            if len(keys) == 0:
+                del self.app.unknown_links_by_cid[cid]
 
 
     def _update_inter_dom_paths(self, hkey, paths):
@@ -303,10 +486,19 @@ class ControllerCommunication:
         if paths[0]["action"] == "delete":
             if hkey in self.inter_dom_paths:
                 del self.inter_dom_paths[hkey]
+                del self.inter_dom_index[hkey]
         elif paths[0]["action"] == "add":
             self.inter_dom_paths[hkey] = paths
+
+            # Index the paths by egress and ingress (first path wins on duplicates)
+            out_index = {}
+            in_index = {}
+            for p in paths:
+                out_index.setdefault(p["out"], p)
+                in_index.setdefault(p["in"], p)
+            self.inter_dom_index[hkey] = (out_index, in_index)
         else:
-            self.logger.info("Unknown action for path %s. Can't update inter dom paths dict" % paths)
+            self.logger.info("Unknown action for path %s. Can't update inter dom paths dict", paths)
 
 
 
@@ -317,59 +509,102 @@ class ControllerCommunication:
         """ On recive, process the message and perform the operation specified by key 'msg' """
         data = pickle.loads(body)
 
-        if data["msg"] == "get_topo":
-            # Recieved a topology request, send the topology information to the root controller
-            self.logger.info("Resending host information")
-            self.send_topo(inter_dom_paths=True)
-
-        elif data["msg"] == "get_id":
-            # Recieved a CID request, send the CID to the root controller
-            self.logger.info("Resending controller ID")
-            self.send_cid()
-
-        elif data["msg"] == "unknown_sw":
-            # Process a unknown Switch CID response message to associate a unknown link with
-            # a external domain
-            self.logger.info("Found CID resolve")
-            key = (data["sw"], data["port"], data["dest_sw"])
-            self.app.unknown_links[key] = data["cid"]
-            self.logger.info("New unknown links: %s" % self.app.unknown_links)
-
-        elif data["msg"] == "compute_paths":
-            # Received inter-domain path computation request
-            self.logger.info("Compute path received")
-            for hkey,paths in data["paths"].iteritems():
-                self.logger.info("%s: %s" % (hkey, paths))
-                self.app.compute_path_segment(hkey, paths)
-                self._update_inter_dom_paths(hkey, paths)
-
-        elif data["msg"] == "ctrl_dead":
-            # Recieved notifcation that a controller is no longer connected
-            self.logger.info("Recieved controller dead notification")
-
-            # Find the links that resolve to the dead controller CID and remove them
-            remove = []
-            for lk, lcid in self.app.unknown_links.iteritems():
-                if lcid == data["cid"]:
-                    remove.append(lk)
-            for r in remove:
-                del self.app.unknown_links[r]
-
-            self.logger.info("New unknown links: %s" % self.app.unknown_links)
-
-        elif data["msg"] == "processed_con":
-            # Received processed inter-domain congestion message
-            self.logger.info("Received processed inter-domain congestion for sw %s port %s" %
-                                (data["sw"], data["port"]))
-            key = (data["sw"], data["port"])
-            if key in self.app.TE.inter_domain_over_util:
-                del self.app.TE.inter_domain_over_util[key]
-                self.logger.info("Congestion resolved, removed from outstanding request dict")
-
+        handler = self._handlers.get(data["msg"])
+        if handler is not None:
+            handler(data)
         else:
             # Unknown operation ...
             self.logger.info("Unknown operation recived ... ignoring!")
 
+        # Acknowledge the messages in batches, a partial batch is acknowledged
+        # after ACK_FLUSH_TIME to allow the broker to push more messages
+        self._unacked += 1
+        self._last_delivery_tag = method.delivery_tag
+        if self._unacked >= self.ACK_BATCH:
+            self._flush_acks()
+        elif self._ack_flush_timer is None:
+            self._ack_flush_timer = self.con_recv.call_later(self.ACK_FLUSH_TIME,
+                                                            self._ack_flush_timer_work)
+
+
+    def _action_get_topo(self, data):
+        """ Recieved a topology request, send the topology information to the root controller.
+
+        Args:
+            data (dict): Message object received from the root controller
+        """
+        self.logger.info("Resending host information")
+        self.send_topo(inter_dom_paths=True)
+
+
+    def _action_get_id(self, data):
+        """ Recieved a CID request, send the CID to the root controller.
+
+        Args:
+            data (dict): Message object received from the root controller
+        """
+        self.logger.info("Resending controller ID")
+        self.send_cid()
+
+
+    def _action_unknown_sw(self, data):
+        """ Process a unknown Switch CID response message to associate a unknown link with
+        a external domain.
+
+        Args:
+            data (dict): Message object received from the root controller
+        """
+        self.logger.info("Found CID resolve")
+        key = (data["sw"], data["port"], data["dest_sw"])
+        self._unindex_unknown_link(key)
+        self.app.unknown_links[key] = data["cid"]
+        self.app.unknown_links_by_cid.setdefault(data["cid"], set()).add(key)
+        self.logger.info("New unknown links: %s", self.app.unknown_links)
+
+
+    def _action_compute_paths(self, data):
+        """ Received inter-domain path computation request.
+
+        Args:
+            data (dict): Message object received from the root controller
+        """
+        self.logger.info("Compute path received")
+        log_paths = self.logger.isEnabledFor(logging.INFO)
+        for hkey,paths in data["paths"].iteritems():
+            if log_paths:
+                self.logger.info("%s: %s", hkey, paths)
+            self.app.compute_path_segment(hkey, paths)
+            self._update_inter_dom_paths(hkey, paths)
+
+
+    def _action_ctrl_dead(self, data):
+        """ Recieved notifcation that a controller is no longer connected.
+
+        Args:
+            data (dict): Message object received from the root controller
+        """
+        self.logger.info("Recieved controller dead notification")
+
+        # Remove the links that resolve to the dead controller CID
+        for lk in self.app.unknown_links_by_cid.pop(data["cid"], ()):
+            self.app.unknown_links.pop(lk, None)
+
+        self.logger.info("New unknown links: %s", self.app.unknown_links)
+
+
+    def _action_processed_con(self, data):
+        """ Received processed inter-domain congestion message.
+
+        Args:
+            data (dict): Message object received from the root controller
+        """
+        self.logger.info("Received processed inter-domain congestion for sw %s port %s",
+                            data["sw"], data["port"])
+        key = (data["sw"], data["port"])
+        if key in self.app.TE.inter_domain_over_util:
+            del self.app.TE.inter_domain_over_util[key]
+            self.logger.info("Congestion resolved, removed from outstanding request dict")
+
 
     def send_cid(self):
         """ Send the controller ID and other attributes to the root controller. Method allows
@@ -378,12 +613,16 @@ class ControllerCommunication:
         # Do not send CID if module not active or instance is not master
         if self.is_active() == False:
             return
-        if self.is_master() == False:
+        if self._is_master_cached == False:
             return
 
-        obj = {"cid": self.cid, "te_thresh": self.app.TE.util_thresh}
-        obj_str = pickle.dumps(obj)
-        self.pika_safe_send(self.DISCOVER_RK, obj_str)
+        # Only re-build the payload if the TE threshold changed
+        te_thresh = self.app.TE.util_thresh
+        if self._cid_payload is None or self._cid_payload_thresh != te_thresh:
+            obj = {"cid": self.cid, "te_thresh": te_thresh}
+            self._cid_payload = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+            self._cid_payload_thresh = te_thresh
+        self.pika_safe_send(self.DISCOVER_RK, self._cid_payload)
 
         # Clear the keep alive timer (we sent data)
         self.clear_keep_alive_timer()
@@ -401,26 +640,28 @@ class ControllerCommunication:
         if self.is_active() == False:
             return
 
+        # Re-use the switches and host info if the topology and hosts did not change
+        # since the last topology message
         hosts = self.app.hosts
-        # Generate the set of switches from the topology
-        # TODO: This needs to be optimised as well, don't really like re-doing this iteration
-        # for every topo change !!!
-        switches = self.app.graph.get_switches()
+        topo_key = (self.app.graph.topo_version, tuple(hosts))
+        if self._topo_cache is not None and self._topo_cache[0] == topo_key:
+            switches = self._topo_cache[1]
+            host_info = self._topo_cache[2]
+        else:
+            # Generate the set of switches from the topology
+            switches = self.app.graph.get_switches()
+
+            # Retrieve the eth and ip address of the host (for egress instalation)
+            host_info = [(h, e, a) for h, (e, a) in
+                    zip(hosts, self.app.graph.get_host_port_info_bulk(hosts))]
 
-        # Retrieve the eth and ip address of the host (for egress instalation)
-        host_info = []
-        for h in hosts:
-            info = self.app.graph.get_port_info(h, -1)
-            host_info.append((h, info["eth_address"], info["address"]))
+            self._topo_cache = (topo_key, switches, host_info)
 
         # Add the speed of the ports to the unknown links GID
-        ulink = {}
-        for ulk, uldata in self.app.unknown_links.iteritems():
-            speed = 0
-            pinfo = self.app.graph.get_port_info(ulk[0], ulk[1])
-            if pinfo is not None:
-                speed = pinfo["speed"]
-            ulink[(ulk[0], ulk[1], ulk[2], speed)] = uldata
+        unknown_links = self.app.unknown_links
+        speeds = self.app.graph.get_port_speed_bulk([(k[0], k[1]) for k in unknown_links])
+        ulink = {(k[0], k[1], k[2], speeds.get((k[0], k[1]), 0)): v
+                    for k, v in unknown_links.iteritems()}
 
         obj = {"cid": self.cid, "hosts": host_info, "switches": switches, "unknown_links": ulink,
                 "te_thresh": self.app.TE.util_thresh}
@@ -428,7 +669,7 @@ class ControllerCommunication:
         if inter_dom_paths:
             obj["paths"] = self.inter_dom_paths
 
-        obj_str = pickle.dumps(obj)
+        obj_str = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
         self.pika_safe_send(self.TOPO_RK, obj_str)
 
         # Clear the keep alive timer (we sent data)
@@ -449,7 +690,7 @@ class ControllerCommunication:
             return
 
         obj = {"cid": self.cid, "sw": sw, "port": port, "dest_sw": dest_sw, "speed": speed}
-        obj_str = pickle.dumps(obj)
+        obj_str = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
         self.pika_safe_send(self.UNKNOWN_SW_RK, obj_str)
 
         # Clear the keep alive timer (we sent data)
@@ -470,17 +711,20 @@ class ControllerCommunication:
         cid = self.app.unknown_links[link_key]
         if isinstance(cid, list):
             cid = None
+        self._unindex_unknown_link(link_key)
         del self.app.unknown_links[link_key]
-        print(self.app.unknown_links)
+        self.logger.debug("Unknown links size: %d", len(self.app.unknown_links))
 
         # Send the notification to the root controller
         obj = {"cid": self.cid, "sw": link_key[0], "port": link_key[1], "to_cid": cid}
-        obj_str = pickle.dumps(obj)
+        obj_str = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
         self.pika_safe_send(self.DEAD_PORT_RK, obj_str)
 
 
     def notify_inter_domain_link_traffic(self, sw, port, tx_bps):
         """ Tell the root controller the ammount of traffic recorded on an inter-domain link.
+        Reports are coalesced for `TRAFFIC_BATCH_TIME` seconds and sent as a single message
+        that contains the latest traffic of each link.
 
         Args:
             sw (int): DPID of the switch that has the inter-domain port
@@ -490,8 +734,24 @@ class ControllerCommunication:
         if self.is_active() == False:
             return
 
-        obj = {"cid": self.cid, "sw": sw, "port": port, "traff_bps": tx_bps}
-        obj_str = pickle.dumps(obj)
+        self._pending_traffic[(sw, port)] = tx_bps
+        if self.traffic_worker is None:
+            self.traffic_worker = hub.spawn(self._traffic_work)
+            self.traffic_worker.name = "LinkTrafficWorker"
+
+
+    def _traffic_work(self):
+        """ Link traffic worker method. Wait `TRAFFIC_BATCH_TIME` seconds and send all
+        pending inter-domain link traffic reports to the root controller.
+        """
+        hub.sleep(self.TRAFFIC_BATCH_TIME)
+        pending = self._pending_traffic
+        self._pending_traffic = {}
+        self.traffic_worker = None
+
+        samples = [(sw, port, tx_bps) for (sw, port), tx_bps in pending.iteritems()]
+        obj = {"cid": self.cid, "samples": samples}
+        obj_str = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
         self.pika_safe_send(self.INTER_LINK_TRAFFIC_RK, obj_str)
 
 
@@ -514,7 +774,7 @@ class ControllerCommunication:
             "traff_bps": traff_bps, "paths": paths,
             "te_thresh": self.app.TE.util_thresh
         }
-        obj_str = pickle.dumps(obj)
+        obj_str = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
         self.pika_safe_send(self.INTER_LINK_CONGESTION_RK, obj_str)
 
 
@@ -534,14 +794,11 @@ class ControllerCommunication:
         paths = None
         if hkey in self.inter_dom_paths:
             paths = self.inter_dom_paths[hkey]
+            out_index = self.inter_dom_index[hkey][0]
             prim = paths[0]
-            sec = None
 
-            # Iterate through the installed paths and try to find the new egress
-            for p in paths:
-                if p["out"] == new_egress:
-                    sec = p
-                    break
+            # Find the installed path of the new egress
+            sec = out_index.get(new_egress)
 
             # If we found the correct out swap the primary paths with the secondary path
             # for which the egress belongs
@@ -549,6 +806,8 @@ class ControllerCommunication:
                 old_egress = prim["out"]
                 prim["out"] = new_egress
                 sec["out"] = old_egress
+                out_index[new_egress] = prim
+                out_index[old_egress] = sec
                 self.logger.info("Found the old root controller paths, modifying egress")
             else:
                 self.logger.error("Could not find new egress in old root controller paths")
@@ -560,7 +819,7 @@ class ControllerCommunication:
         # Notify the root controller of the egress change for the inter-domain path
         self.logger.info("Notifying the root controller of the egress change on the inter-domain path")
         obj = {"cid": self.cid, "hkey": hkey, "new_paths": paths}
-        obj_str = pickle.dumps(obj)
+        obj_str = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
         self.pika_safe_send(self.INTER_LINK_EGRESS_CHANGE_RK, obj_str)
 
 
@@ -582,19 +841,18 @@ class ControllerCommunication:
         paths = None
         if hkey in self.inter_dom_paths:
             paths = self.inter_dom_paths[hkey]
+            out_index, in_index = self.inter_dom_index[hkey]
             prim = paths[0]
-            sec = None
 
-            # Look for the secondary path in the inter-dom installed paths list
-            for p in paths:
-                if p["in"] == new_ingress:
-                    sec = p
-                    break
+            # Look for the secondary path in the inter-dom installed paths
+            sec = in_index.get(new_ingress)
 
             # If we found the correct paths swap the primary and secondary path ingress
             if sec is not None:
                 prim["in"] = new_ingress
                 sec["in"] = old_ingress
+                in_index[new_ingress] = prim
+                in_index[old_ingress] = sec
                 self.logger.info("Found the old root controller paths, modifying ingress")
 
                 # Only update egress if we are a transit inter-domain path segment and
@@ -602,6 +860,8 @@ class ControllerCommunication:
                 if isinstance(old_egress, tuple) and not old_egress == new_egress:
                     prim["out"] = new_egress
                     sec["out"] = old_egress
+                    out_index[new_egress] = prim
+                    out_index[old_egress] = sec
                     self.logger.info("Modified egress of old root controller path")
             else:
                 self.logger.error("Could not find new ingress in old root controller paths")
@@ -613,7 +873,7 @@ class ControllerCommunication:
         # Notify the root controller of the ingress change for the inter-domain path
         self.logger.info("Notifying the root controller of the ingress change on the inter-domain path")
         obj = {"cid": self.cid, "hkey": hkey, "new_paths": paths}
-        obj_str = pickle.dumps(obj)
+        obj_str = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
         self.pika_safe_send(self.INTER_LINK_INGRESS_CHANGE_RK, obj_str)
 
 
@@ -622,24 +882,45 @@ class ControllerCommunication:
 
 
     def stop_keep_alive_timer(self):
-        """ Stop any running instance of the keep-alive timer. Method should
+        """ Stop any running instance of the keep-alive worker. Method should
         be called when instance is demoted to slave.
         """
         self.logger.debug("Stopping keep alive timer ...")
-        if self.keep_alive_timer is not None:
-            self.keep_alive_timer.cancel()
-        self.keep_alive_timer = None
+        self._last_send_ts = None
+        if self.keep_alive_worker is not None:
+            hub.kill(self.keep_alive_worker)
+        self.keep_alive_worker = None
 
 
     def clear_keep_alive_timer(self):
         """ Start/reset the inactivity keep alive timer for the controller.
-        The timer will trigger a method that sends the controller ID to the
-        root controller every `cls:CTRL_KEEP_ALIVE` of inactivity (no messages
-        sent) to prevent the connection from closing.
+        The keep alive worker will send the controller ID to the root
+        controller every `cls:CTRL_KEEP_ALIVE` of inactivity (no messages
+        sent) to prevent the connection from closing. Resetting the timer only
+        records the send time, the worker thread is started once and re-used.
         """
-        if self.keep_alive_timer is not None:
-            self.keep_alive_timer.cancel()
-
-        self.keep_alive_timer = Timer(self.KEEP_ALIVE, self.send_cid)
-        self.keep_alive_timer.start()
+        self._last_send_ts = time.time()
+        if self.keep_alive_worker is None:
+            self.keep_alive_worker = hub.spawn(self._keep_alive_work)
+            self.keep_alive_worker.name = "KeepAliveWorker"
         self.logger.debug("Cleared controller keep alive timer")
+
+
+    def _keep_alive_work(self):
+        """ Keep alive worker method. Sleep until `KEEP_ALIVE` seconds passed since
+        data was last sent and then send the CID. Every wake up also services the
+        send connections (`_service_send_cons`) so idle send classes keep their
+        heartbeats. If no data is sent (instance is not master) the worker stops
+        until the timer is cleared again.
+        """
+        while self._last_send_ts is not None:
+            self._service_send_cons()
+            delta = self.KEEP_ALIVE - (time.time() - self._last_send_ts)
+            if delta > 0:
+                hub.sleep(delta)
+                continue
+
+            self._last_send_ts = None
+            self.send_cid()
+
+        self.keep_alive_worker = None
@@ -10,10 +10,10 @@ Usage:
     host_name = Name of host we are advertising discovery=
 """
 
-import os
 import sys
 import struct
 import time
+import fcntl
 
 from socket import *
 
@@ -33,19 +33,25 @@ class LLDPPacket(object):
         PORT_ID_STR: Format string used to generate the port ID TLV
         HOST_NAME_PREFIX: Prefix added to the system name TLV of the LLDP
         HOST_NAME_FMT: Format string used to generate the host name TLV
+        PORT_ID: Pre-compiled struct of `PORT_ID_STR`
     """
     CHASSIS_ID_PREFIX = "dpid:"
     CHASSIS_ID_FMT = CHASSIS_ID_PREFIX + "%s"
     PORT_ID_STR = "!I"
+    PORT_ID = struct.Struct(PORT_ID_STR)
     HOST_NAME_PREFIX = "host:"
     HOST_NAME_FMT = HOST_NAME_PREFIX + "%s"
 
+    # Serialized packets of previous ``lldp_packet()`` calls, keyed by arguments
+    _cache = {}
+
 
     @staticmethod
     def lldp_packet(host_pn, host_name, addr, host_dpid=0xffffffff,
                 host_mac=DONTCARE_STR, ttl=0):
         """Create a new LLDP packet for host discovery. Packet will have specific
-        TLVs based on our host discovery requirements.
+        TLVs based on our host discovery requirements. The packet is only built
+        and serialized once for every set of arguments.
 
         Args:
             host_pn (int): Port of the host that connects to the switch.
@@ -60,7 +66,22 @@ class LLDPPacket(object):
         Returns:
             (bytes): Data of encoded LLDP packet including L2 ethernet framing.
         """
+        key = (host_pn, host_name, addr, host_dpid, host_mac, ttl)
+        data = LLDPPacket._cache.get(key)
+        if data is None:
+            data = LLDPPacket._build(*key)
+            LLDPPacket._cache[key] = data
+        return data
+
+
+    @staticmethod
+    def _build(host_pn, host_name, addr, host_dpid, host_mac, ttl):
+        """ Build and serialize a host discovery LLDP packet. See ``lldp_packet()``
+        for the arguments.
 
+        Returns:
+            (bytes): Data of encoded LLDP packet including L2 ethernet framing.
+        """
         # Generate a new packet and add eth framing to it
         pkt = packet.Packet()
         dst = lldp.LLDP_MAC_NEAREST_BRIDGE
@@ -77,7 +98,7 @@ class LLDPPacket(object):
 
         tlv_port_id = lldp.PortID(
             subtype=lldp.PortID.SUB_PORT_COMPONENT,
-            port_id=struct.pack(LLDPPacket.PORT_ID_STR, host_pn))
+            port_id=LLDPPacket.PORT_ID.pack(host_pn))
 
         tlv_system_name = lldp.SystemName(system_name=LLDPPacket.HOST_NAME_FMT
             % host_name)
@@ -95,20 +116,73 @@ class LLDPPacket(object):
 
         # Serialize and return the data of the complated packet
         pkt.serialize()
-        return pkt.data
+        return bytes(pkt.data)
+
 
+# ioctl request to retrieve the IPv4 address of an interface (linux/sockios.h)
+SIOCGIFADDR = 0x8915
+# Packet socket option to bypass the qdisc layer on transmit (linux/if_packet.h)
+SOL_PACKET = 263
+PACKET_QDISC_BYPASS = 20
 
-def send_ether(payload, iface):
+
+def open_ether(iface):
+    """ Open a raw socket bound to interface `iface` to send packets on. If supported
+    by the kernel (3.14+), sent packets bypass the qdisc (traffic control) layer.
+
+    Args:
+        iface (str): Name of interface to send raw packets on
+
+    Returns:
+        socket: Raw socket bound to `iface`
+    """
+    s = socket(AF_PACKET, SOCK_RAW)
+    s.bind((iface, 0))
+    try:
+        s.setsockopt(SOL_PACKET, PACKET_QDISC_BYPASS, 1)
+    except error:
+        pass
+    return s
+
+
+def send_ether(payload, iface, sock=None):
     """ Send a packet far packet `payload` on interface `iface`. Please
     note that we expect a complete packet including the ethernet framing.
 
     Args:
         payload (bytes): Packet data
         iface (str): Name of interface to send raw packet on
+        sock (socket): Raw socket opened with ``open_ether()`` to send the packet on.
+            Defaults to None (open a new socket).
     """
-    s = socket(AF_PACKET, SOCK_RAW)
-    s.bind((iface, 0))
-    s.send(payload)
+    if sock is None:
+        sock = open_ether(iface)
+    sock.send(payload)
+
+
+def get_iface_addr(iface):
+    """ Retrieve the ethernet and IPv4 address of interface `iface` without spawning
+    a shell. The MAC is read from sysfs and the IP is retrieved using a SIOCGIFADDR ioctl.
+
+    Args:
+        iface (str): Name of the interface
+
+    Returns:
+        (str, str): IP and ethernet address of the interface
+
+    Raises:
+        IOError: Interface dosen't exist or dosen't have an IPv4 address
+    """
+    with open("/sys/class/net/%s/address" % iface) as f:
+        eth_addr = f.read().strip()
+
+    s = socket(AF_INET, SOCK_DGRAM)
+    try:
+        ifreq = fcntl.ioctl(s.fileno(), SIOCGIFADDR, struct.pack("256s", iface[:15]))
+    finally:
+        s.close()
+    ip_addr = inet_ntoa(ifreq[20:24])
+    return ip_addr, eth_addr
 
 
 if __name__ == "__main__":
@@ -129,25 +203,23 @@ if __name__ == "__main__":
         sleep_time = float(sys.argv[4])
 
     # Get the ip address of the specified interface and gen the LLDP packet
-    ip_out = os.popen("ip addr show %s" % iface).read()
     try:
-        ip_addr = ip_out.split("inet ")[1].split("/")[0]
-        eth_addr = ip_out.split("link/ether ")[1].split(" ")[0]
-        #ip_addr = ip_out.split("inet ")[1].split(" ")[0]
-    except IndexError:
+        ip_addr, eth_addr = get_iface_addr(iface)
+    except IOError:
         print ("Iface %s dosen't exist or dosen't have IP!" % iface)
         sys.exit(0)
 
     packet = LLDPPacket.lldp_packet(1, hostname, ip_addr, host_mac=eth_addr)
+    sock = open_ether(iface)
 
     # Send LLDP packets on the specified interface every 0.5 of a second
     # for up to time seconds (or unitl CTRL+C is recived or script terminated) or
     # indefinetly if time is 0 or less.
     if run_time <= 0:
         while True:
-            send_ether(packet, iface=iface)
+            sock.send(packet)
             time.sleep(sleep_time)
     else:
         for i in range(run_time):
-            send_ether(packet, iface=iface)
+            sock.send(packet)
             time.sleep(sleep_time)
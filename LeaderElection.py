@@ -1,12 +1,54 @@
 #!/usr/bin/python
 
-from threading import Thread, Lock, Event, Timer
+from threading import Thread, Lock, Event, Condition
+from collections import Counter
+import heapq
 import pika
-import pickle
-import random
+import struct
+import uuid
 import time
 
 
+# Leader election message encoding. Messages are a fixed header (message code,
+# inst_id and role code) followed by the sender's queue name (QID).
+MSG_HEADER = struct.Struct("!BIB")
+MSG_CODES = {"find": 0, "keep_alive": 1}
+MSG_NAMES = dict((v, k) for k, v in MSG_CODES.iteritems())
+ROLE_CODES = {"unknown": 0, "master": 1, "slave": 2}
+ROLE_NAMES = dict((v, k) for k, v in ROLE_CODES.iteritems())
+
+
+def encode_msg(msg, inst_id=0, role="unknown", qid=""):
+    """ Encode a leader election message.
+
+    Args:
+        msg (str): Type of message, key of `:mod:attr:(MSG_CODES)`
+        inst_id (int): Instance ID of the sender. Defaults to 0.
+        role (str): Role of the sender, key of `:mod:attr:(ROLE_CODES)`.
+            Defaults to unknown.
+        qid (str): Receive queue name of the sender. Defaults to empty.
+
+    Returns:
+        str: Encoded message
+    """
+    return MSG_HEADER.pack(MSG_CODES[msg], inst_id, ROLE_CODES[role]) + qid.encode("ascii")
+
+
+def decode_msg(body):
+    """ Decode a leader election message encoded with ``encode_msg()``.
+
+    Args:
+        body (str): Encoded message
+
+    Returns:
+        dict: Message in format {"msg": <msg>, "inst_id": <inst_id>, "role": <role>,
+            "QID": <qid>}. Unknown message codes have a 'msg' of None.
+    """
+    msg, inst_id, role = MSG_HEADER.unpack_from(body)
+    return {"msg": MSG_NAMES.get(msg), "inst_id": inst_id,
+            "role": ROLE_NAMES.get(role, "unknown"), "QID": body[MSG_HEADER.size:]}
+
+
 class LeaderElection:
     """ Class that handles leader election between a group of instances. The
     master instance is selected based on ID order were lowest inst_id promotes
@@ -26,25 +68,32 @@ class LeaderElection:
         defined amount of time before assigning role to local instance (i.e
         should we become a master or slave).
 
-        2) Generate and send periodic keep-alives messages. On keep-alive timer
-        trigger, start the time-out detect timer.
+        2) Generate and send periodic keep-alives messages.
+
+        3) On keep-alive receive, push the instance's new expiry deadline
+        (`EXPIRE_INTERVAL` from now) onto the expiry heap.
 
-        3) On time-out detect timer trigger, go through all controllers and
-        decrement observed keep alive count. If value reaches 0, expire
-        instance. If failed instance is master, check if we are new master.
+        4) When the earliest expiry deadline expires, expire the instances
+        that did not send a keep-alive since. If failed instance is master,
+        check if we are new master.
 
-        4) On keep-alive receive, increemnt controller keep alive count.
+    The keep-alive, expiry and init timers are deadlines executed by a single
+    timer thread (`:cls:attr:(timer_thread)`) that sleeps until the earliest
+    deadline expires or a deadline is reset.
 
-    The controller failure detection works similar to a token bucket were
-    a token (count) is added for every received keep-alive and every
-    time-out interval, a count is removed. This offers a tolerance of several
-    keep-alive intervals for controller failures (in case delays occur).
+    The expiry interval offers a tolerance of several keep-alive intervals for
+    controller failures (in case delays occur). Work is only done when a
+    keep-alive is received or an instance deadline expires.
     """
 
     HOST = "127.0.0.1"
     EXCHANGE = "SDN_Bridge"
     EXCHANGE_TYPE = "topic"
 
+    # Number of RabbitMQ connection attempts and initial retry backoff (seconds)
+    CON_TRIES = 3
+    CON_BACKOFF = 0.5
+
     # Timer interval values
     KEEP_ALIVE_INTERVAL = 1.0
     # XXX: Timeout timer is reset every keep alive interval
@@ -58,10 +107,14 @@ class LeaderElection:
     INIT_TIMER_INTERVAL = TIMEOUT_INTERVAL
 
     # Wait N missed keep-alive intervals before declaring a controller as
-    # failed (set the controller keep-alive counter to this value when a keep
-    # alive is received).
+    # failed.
     KEEP_ALIVE_WAIT_MISS = 1
 
+    # Time after the last received keep-alive an instance is declared failed.
+    # Equal to the detection time of the previous counter based time-out
+    # (decremented every keep alive interval, offset by the time-out interval).
+    EXPIRE_INTERVAL = KEEP_ALIVE_WAIT_MISS * KEEP_ALIVE_INTERVAL + TIMEOUT_INTERVAL
+
     def __init__(self, logger, dom_id=0, channel_format="c.{DOM_ID}.discover",
                     inst_id=None):
         """ Initiate a new leader election instance on a seperate therad.
@@ -79,29 +132,33 @@ class LeaderElection:
         self.logger = logger
         self.channel = channel_format.format(DOM_ID=dom_id)
 
-        # Define empty variables to hold the send and receive connections and channels
-        self.con_send = None
-        self.con_recv = None
-        self.chn_send = None
-        self.chn_recv = None
+        # Define empty variables to hold the connection and channel (used to send
+        # and receive)
+        self.con = None
+        self.chn = None
         self.queue_name = None
 
+        # Encoded keep-alive message, cleared when the inst_id or role changes
+        self._keep_alive_cache = None
+
         # Generate a random inst_id if one was not provided and initiate the
         # role attributes, locks, timers and dictionaries
+        self.ctrl_role_lock = Lock()
         if inst_id is None:
             self._regenerate_inst_id()
         else:
             self.inst_id = inst_id
 
         self.ctrl_role = "unknown"
-        self.ctrl_role_lock = Lock()
         self.ctrl_role_change_event = Event()
 
-        self.keep_alive_timer = None
-        self.timeout_timer = None
-        self.init_timer = None
-        self.send_lock = Lock()
+        self.keep_alive_deadline = None
+        self.init_deadline = None
+        self.expiry = []
+        self.timer_cond = Condition()
+        self.timer_thread = None
         self.controllers = {}
+        self.role_counts = Counter()
 
         # Construct and start the main thread
         self.thread = Thread(target=self._main_loop, name="LeaderElectionTH")
@@ -116,6 +173,7 @@ class LeaderElection:
         """ Set the controller role """
         with self.ctrl_role_lock:
             self.ctrl_role = role
+            self._keep_alive_cache = None
             self.logger.info("Set controller role to %s" % role)
             self.logger.critical("XXXEMUL,%f,role,%s" % (time.time(), role))
             self.ctrl_role_change_event.set()
@@ -130,23 +188,47 @@ class LeaderElection:
         Returns:
             bool: True if a master already exists, false otherwise
         """
-        for inst_id,data in self.controllers.items():
-            if data["role"] == "master":
-                return True
-        return False
+        return self.role_counts["master"] > 0
+
+    def _set_role(self, inst_id, role):
+        """ Set the role of instance `inst_id` in `:cls:attr:(controllers)` and update
+        the number of instances with each role (`:cls:attr:(role_counts)`).
+
+        Args:
+            inst_id (int): ID of the instance to update
+            role (str): New role of the instance
+        """
+        data = self.controllers[inst_id]
+        self.role_counts[data["role"]] -= 1
+        data["role"] = role
+        self.role_counts[role] += 1
+
+    def _remove_controller(self, inst_id):
+        """ Remove instance `inst_id` from `:cls:attr:(controllers)` and update
+        `:cls:attr:(role_counts)`.
+
+        Args:
+            inst_id (int): ID of the instance to remove
+        """
+        data = self.controllers.pop(inst_id)
+        self.role_counts[data["role"]] -= 1
 
 
     def stop(self):
         """ Stop the thread by stopping the receive channel from consuming. Method
-        blocks until the thread object finishes """
-        self.con_recv.add_callback_threadsafe(
-            self.chn_recv.stop_consuming
+        blocks until the thread object finishes and wakes up any waiters of
+        `:cls:attr:(ctrl_role_change_event)` """
+        self.con.add_callback_threadsafe(
+            self.chn.stop_consuming
         )
 
         # Wait for the thread to stop and null the instance
         self.thread.join()
         self.thread = None
 
+        # Wake up role change waiters so they can see the instance is no longer active
+        self.ctrl_role_change_event.set()
+
     def is_active(self):
         """ Check if the worker thread is active (not null).
 
@@ -156,98 +238,159 @@ class LeaderElection:
         return self.thread is not None
 
     def _regenerate_inst_id(self):
-        """ Regenerate the controller's instance ID """
+        """ Regenerate the controller's instance ID (random non-zero 32 bit value
+        derived from a UUID, fits the keep-alive message encoding). The inst_id is
+        changed under `:cls:attr:(ctrl_role_lock)` so a keep-alive encoded with the
+        old inst_id can't be cached after the cache is cleared. """
         self.logger.info("Regenerating inst_id")
-        self.inst_id = random.randint(1,10000)
+        with self.ctrl_role_lock:
+            self.inst_id = (uuid.uuid4().int & 0xFFFFFFFF) or 1
+            self._keep_alive_cache = None
 
     def is_init_phase(self):
         """ Check if controller is currently in the initiation phase,
-        `:cls:attr:(init_timer)` is not null.
+        `:cls:attr:(init_deadline)` is not null.
 
         Returns:
             bool: True if instance is in init phase, false otherwise
         """
-        return self.init_timer is not None
+        return self.init_deadline is not None
 
 
     # ---------------------- TIMER METHODS ----------------------
 
 
-    def _reset_keep_alive_timer(self):
-        """ Reset the keep alive timer, advertise the controller inst_id and
-        reset the time-out timer to detect failed instnaces.
+    def _timer_loop(self):
+        """ Timer thread loop. Wait until the earliest keep alive, instance expiry
+        (`:cls:attr:(expiry)`) or init deadline expires (or a deadline is changed)
+        and execute the callbacks of the expired deadlines. Loop exits when
+        `:cls:attr:(timer_thread)` is cleared.
         """
-        # If the timer is running cancel it
-        if self.keep_alive_timer is not None:
-            self.keep_alive_timer.cancel()
+        while True:
+            with self.timer_cond:
+                if self.timer_thread is None:
+                    return
+
+                deadlines = [d for d in (self.keep_alive_deadline,
+                            self.init_deadline) if d is not None]
+                if len(self.expiry) > 0:
+                    deadlines.append(self.expiry[0][0])
+                now = time.time()
+                if len(deadlines) == 0:
+                    self.timer_cond.wait()
+                    continue
+                if min(deadlines) > now:
+                    self.timer_cond.wait(min(deadlines) - now)
+                    continue
+
+                # Clear the expired deadlines before running the callbacks
+                keep_alive = self._expired(self.keep_alive_deadline, now)
+                timeout = len(self.expiry) > 0 and self.expiry[0][0] <= now
+                init = self._expired(self.init_deadline, now)
+                if keep_alive:
+                    self.keep_alive_deadline = None
+                if init:
+                    self.init_deadline = None
+
+            # Run the callbacks without holding the condition lock
+            if timeout:
+                self._timeout_timer_work()
+            if init:
+                self._init_timer_work()
+            if keep_alive:
+                self._keep_alive_timer_work()
+
+    @staticmethod
+    def _expired(deadline, now):
+        """ Check if a deadline is set and has expired.
 
+        Args:
+            deadline (float): Deadline time or None if not set
+            now (float): Current time
+
+        Returns:
+            bool: True if `deadline` expired, false otherwise
+        """
+        return deadline is not None and deadline <= now
+
+    def _start_timer_thread(self):
+        """ Start the timer thread that executes the timer callbacks """
+        with self.timer_cond:
+            self.timer_thread = Thread(target=self._timer_loop, name="LeaderElectionTimerTH")
+            self.timer_thread.daemon = True
+        self.timer_thread.start()
+
+    def _stop_timer_thread(self):
+        """ Stop the timer thread and clear all deadlines """
+        with self.timer_cond:
+            thread = self.timer_thread
+            self.timer_thread = None
+            self.keep_alive_deadline = None
+            self.init_deadline = None
+            self.expiry = []
+            self.timer_cond.notify()
+
+        if thread is not None:
+            thread.join()
+
+    def _reset_keep_alive_timer(self):
+        """ Reset the keep alive timer and advertise the controller inst_id """
         # Send the inst_id and resetart the timer
         self._send_inst_id()
-        self.keep_alive_timer = Timer(self.KEEP_ALIVE_INTERVAL, self._keep_alive_timer_work)
-        self.keep_alive_timer.start()
-        self._reset_timeout_timer()
+        with self.timer_cond:
+            self.keep_alive_deadline = time.time() + self.KEEP_ALIVE_INTERVAL
+            self.timer_cond.notify()
 
     def _keep_alive_timer_work(self):
         """ Callback executed on keep alive timer trigger """
-        self.keep_alive_timer = None
         self._reset_keep_alive_timer()
 
-    def _reset_timeout_timer(self):
-        """ Reset the time-out timer """
-        # If the timer is running cancel it
-        if self.timeout_timer is not None:
-            self.timeout_timer.cancel()
-
-        self.timeout_timer = Timer(self.TIMEOUT_INTERVAL, self._timeout_timer_work)
-        self.timeout_timer.start()
-
     def _timeout_timer_work(self):
-        """ Callback executed on timeout timer trigger. Check if a controller
-        has failed. If the master controller has failed, perform leader
-        selection (promote myself to master if inst_id is lowest)
+        """ Callback executed when the earliest instance expiry deadline expires.
+        Check if a controller has failed (no keep-alive received before its deadline).
+        If the master controller has failed, perform leader selection (promote
+        myself to master if inst_id is lowest)
         """
-        # Check for dead instances and if we need to become the new master
+        # Pop the expired deadlines, skipping instances that sent a keep-alive
+        # after the deadline was pushed (the deadline is stale). The dead instances
+        # are removed under the same lock so a keep-alive received concurrently
+        # can't be lost.
+        now = time.time()
         check_master = False
-        for inst_id,data in self.controllers.items():
-            # OUTPUT THE CURRENT INSTANCE ID COUNT
-            self.logger.info("Inst %d count %s %f" % (inst_id, data["count"],
-                                                        time.time()))
-
-            if data["count"] <= 0:
-                # Found a dead instance
-                self.logger.info("\tInst %d timed out (%s)" % (inst_id, data))
-                self.logger.critical("XXXEMUL,%f,inst_fail,%s" % (time.time(),
-                                                                inst_id))
+        log = self.logger
+        with self.timer_cond:
+            while len(self.expiry) > 0 and self.expiry[0][0] <= now:
+                deadline, inst_id = heapq.heappop(self.expiry)
+                data = self.controllers.get(inst_id)
+                if data is None or data["deadline"] != deadline:
+                    continue
+
+                # Remove the dead instance and check if we need to become the new master
+                log.info("\tInst %d timed out (%s)", inst_id, data)
+                log.critical("XXXEMUL,%f,inst_fail,%s", now, inst_id)
                 if data["role"] == "master":
                     check_master = True
+                self._remove_controller(inst_id)
 
-                # Delete the dead instance from the list
-                self.logger.info("\tInst %d count %s" % (inst_id, data["count"]))
-                del self.controllers[inst_id]
-            else:
-                # Consume a received keep alive for the controller
-                data["count"] -= 1
+            promote = (check_master and (len(self.controllers) == 0 or
+                        self.inst_id <= min(self.controllers)))
 
-        ctrl_keys = sorted(self.controllers.keys())
-        if (check_master and (len(ctrl_keys) == 0 or
-                    self.inst_id <= ctrl_keys[0])):
+        if promote:
             # XXX: We are the new master, take over
             self.set_ctrl_role("master")
 
-        # Clear the timer
-        self.timeout_timer = None
-
     def _init_timer_work(self):
         """ Callback executed on initiation timmer trigger (start of app). """
         self.logger.info("Initiation timmer triggered")
-        self.init_timer = None
 
         # Work out if we should become the new mater os a slave. We will be set
         # as master only if there are no other instances, or other non-master
         # instances exist and our inst_id is the lower number.
-        ctrl_keys = sorted(self.controllers.keys())
-        if (len(ctrl_keys) == 0 or (self.master_exists() == False and
-                                    self.inst_id <= ctrl_keys[0])):
+        with self.timer_cond:
+            promote = (len(self.controllers) == 0 or (self.master_exists() == False and
+                                    self.inst_id <= min(self.controllers)))
+
+        if promote:
             self.set_ctrl_role("master")
         else:
             self.set_ctrl_role("slave")
@@ -257,12 +400,14 @@ class LeaderElection:
 
 
     def _send_inst_id(self):
-        """ Send the controller's inst_id and role """
-        obj = {"msg": "keep_alive",
-                "inst_id": self.inst_id,
-                "role": self.get_ctrl_role(),
-                "QID": self.queue_name}
-        obj_str = pickle.dumps(obj)
+        """ Send the controller's inst_id and role. The encoded message is cached
+        until the inst_id or role changes. """
+        with self.ctrl_role_lock:
+            obj_str = self._keep_alive_cache
+            if obj_str is None:
+                obj_str = encode_msg("keep_alive", self.inst_id, self.ctrl_role,
+                                        self.queue_name)
+                self._keep_alive_cache = obj_str
         self._pika_safe_send(self.channel, obj_str)
 #        self.logger.info("Sent keep alive %s (QID: %s) at %f" % (self.inst_id,
 #                            self.queue_name, time.time()))
@@ -270,25 +415,24 @@ class LeaderElection:
 
     def _send_find(self):
         """ Send a find message """
-        obj = {"msg": "find"}
-        obj_str = pickle.dumps(obj)
+        obj_str = encode_msg("find")
         self._pika_safe_send(self.channel, obj_str)
         self.logger.info("Sending find")
         self.logger.critical("XXXEMUL,%f,send_find" % time.time())
 
         # Start the init timer work to promote to master if no ctrl responds
-        self.init_timer = Timer(self.INIT_TIMER_INTERVAL, self._init_timer_work)
-        self.init_timer.start()
+        with self.timer_cond:
+            self.init_deadline = time.time() + self.INIT_TIMER_INTERVAL
+            self.timer_cond.notify()
 
 
     def _on_receive(self, chn, method, properties, body):
         """ Process the received message """
-        data = pickle.loads(body)
+        data = decode_msg(body)
 
         if data["msg"] == "find":
             # Received a controller find request so reset the timers
             self._reset_keep_alive_timer()
-            #self._reset_timeout_timer()
 
         elif data["msg"] == "keep_alive":
             # Received a keep alive message, if this message is from the
@@ -316,24 +460,31 @@ class LeaderElection:
                             # Both ctrls are slave so regen if the queue name is lower
                             self._regenerate_inst_id()
                 return
-            elif data["inst_id"] not in self.controllers:
-                # Discovered a new instance, add details
-                self.controllers[data["inst_id"]] = {
-                    "role": "unknown",
-                    "count": 0
-                }
 
-            # Update instance info with advertised role and increment count
-            self.controllers[data["inst_id"]]["role"] = data["role"]
-            self.controllers[data["inst_id"]]["count"] = self.KEEP_ALIVE_WAIT_MISS
+            # Add any newly discovered instance, update the instance info with the
+            # advertised role and push the new expiry deadline. The timer thread
+            # removes expired instances under the same lock.
+            deadline = time.time() + self.EXPIRE_INTERVAL
+            with self.timer_cond:
+                if data["inst_id"] not in self.controllers:
+                    self.controllers[data["inst_id"]] = {
+                        "role": "unknown",
+                        "deadline": None
+                    }
+                    self.role_counts["unknown"] += 1
+
+                self._set_role(data["inst_id"], data["role"])
+                self.controllers[data["inst_id"]]["deadline"] = deadline
+                heapq.heappush(self.expiry, (deadline, data["inst_id"]))
+                self.timer_cond.notify()
 
             # If local instance is in init phase, and a master instance was
             # discovered, demote instance to slave and end init phase early.
             if self.is_init_phase() and data["role"] == "master":
                 self.logger.info("Found master, stopping init phase early")
                 self.set_ctrl_role("slave")
-                self.init_timer.cancel()
-                self.init_timer = None
+                with self.timer_cond:
+                    self.init_deadline = None
 
             # XXX: While the above code makes sense, the SW would take some
             # time to establish a connection with the controller via the topo
@@ -349,46 +500,38 @@ class LeaderElection:
 
 
     def _main_loop(self):
-        """ Main thread loop, init two pika sockets and block on receive """
+        """ Main thread loop, init the pika connection and block on receive """
         try:
-            # Initiate two rabbitMQ connections, one for sending and one for reciving
-            self.con_send, self.chn_send = self._init_rabbitmq_con()
-            self.con_recv, self.chn_recv = self._init_rabbitmq_con()
+            # Initiate the rabbitMQ connection used for sending and reciving
+            self.con, self.chn = self._init_rabbitmq_con()
 
-            # Register for messages on the sending connection
-            res = self.chn_recv.queue_declare("", exclusive=True)
+            # Register for messages on the connection
+            res = self.chn.queue_declare("", exclusive=True)
             self.queue_name = res.method.queue
-            self.chn_recv.queue_bind(exchange=self.EXCHANGE, queue=self.queue_name, routing_key=self.channel)
+            self.chn.queue_bind(exchange=self.EXCHANGE, queue=self.queue_name, routing_key=self.channel)
 
             # Initiate the timers
+            self._start_timer_thread()
             self._reset_keep_alive_timer()
-            #self._reset_timeout_timer()
             self.logger.info("Initiated controller RabbitMQ connections, chanel and exchanges")
 
             # Send a controller find message
             self._send_find()
 
-            self.chn_recv.basic_consume(queue=self.queue_name, on_message_callback=self._on_receive,
+            self.chn.basic_consume(queue=self.queue_name, on_message_callback=self._on_receive,
                                         auto_ack=True)
-            self.chn_recv.start_consuming()
+            self.chn.start_consuming()
         finally:
             self.logger.info("Cleaning up leader election connections to RabbitMQ")
 
             # Stop any running timers
-            if self.keep_alive_timer is not None:
-                self.keep_alive_timer.cancel()
-            if self.timeout_timer is not None:
-                self.timeout_timer.cancel()
+            self._stop_timer_thread()
 
             # Consolidate closing connections (catch any RabbitMQ errors)
-            if self.chn_recv is not None and self.chn_recv.is_open:
-                self._pika_safe_cmd(self.chn_recv.close)
-            if self.chn_send is not None and self.chn_send.is_open:
-                self._pika_safe_cmd(self.chn_send.close)
-            if self.con_recv is not None and self.con_recv.is_open:
-                self._pika_safe_cmd(self.con_recv.close)
-            if self.con_send is not None and self.con_send.is_open:
-                self._pika_safe_cmd(self.con_send.close)
+            if self.chn is not None and self.chn.is_open:
+                self._pika_safe_cmd(self.chn.close)
+            if self.con is not None and self.con.is_open:
+                self._pika_safe_cmd(self.con.close)
 
 
     # -------------------- RabbitMQ initiation and helper methods ----------------------
@@ -396,43 +539,50 @@ class LeaderElection:
 
     def _init_rabbitmq_con(self):
         """ Initiate a new RabbitMQ connection and retrieve the connection objects.
+        If the broker can't be reached, the connection is retried up to `CON_TRIES`
+        times with an exponential backoff starting at `CON_BACKOFF` seconds.
 
         Returns:
             (obj, obj): Connection object and chanel for the connection
+
+        Raises:
+            pika.exceptions.AMQPConnectionError: Broker unreachable after `CON_TRIES`
         """
-        con = pika.BlockingConnection(pika.ConnectionParameters(host=self.HOST))
+        backoff = self.CON_BACKOFF
+        for attempt in range(self.CON_TRIES):
+            try:
+                con = pika.BlockingConnection(pika.ConnectionParameters(host=self.HOST))
+                break
+            except pika.exceptions.AMQPConnectionError:
+                if attempt == self.CON_TRIES - 1:
+                    raise
+                self.logger.error("Could not connect to RabbitMQ, retrying in %s seconds",
+                                    backoff)
+                time.sleep(backoff)
+                backoff *= 2
+
         chn = con.channel()
         chn.exchange_declare(exchange=self.EXCHANGE, exchange_type=self.EXCHANGE_TYPE, auto_delete=True)
         return con, chn
 
 
     def _pika_safe_send(self, routing_key, data):
-        """ Perform a thread safe send command on `:mod:attr:(chn_send)` using the routing
-        key `routing_key` and sending string `data`. Method will try to aquire lock
-        `:mod:attr:(send_lock)` before sending data. If a Pike exception occurs when
-        sending the method will try to re-start the chanel instance and re-call the
-        send method.
+        """ Perform a thread safe send of string `data` using the routing key
+        `routing_key`. The publish on `:cls:attr:(chn)` is scheduled to run on the
+        connection's IO thread (main loop), so the method can be called from any
+        thread. If the connection is closed, the message is dropped.
 
         Args:
             routing_key (str): Routing key to use for sending data
             data (str): Data to send
         """
         try:
-            with self.send_lock:
-                self.chn_send.basic_publish(exchange=self.EXCHANGE, routing_key=routing_key, body=data)
+            self.con.add_callback_threadsafe(
+                lambda: self._pika_safe_cmd(lambda: self.chn.basic_publish(
+                        exchange=self.EXCHANGE, routing_key=routing_key, body=data))
+            )
         except pika.exceptions.AMQPError:
-            self.logger.error("Exception while sending, restarting and trying again")
-
-            # Close the send channel and connection
-            if self.chn_send is not None and self.chn_send.is_open:
-                self._pika_safe_cmd(chn_send.close)
-            if self.con_send is not None and self.con_send.is_open:
-                self._pika_safe_cmd(con_send.close)
-
-            # Restart the connection and channel and re-call the safe send command
-            self.con_send = pika.BlockingConnection(pika.ConnectionParameters(host=self.HOST))
-            self.chn_send = con_send.channel()
-            self.pika_safe_send(routing_key, data)
+            self.logger.error("Exception while sending, connection is closed")
 
 
     def _pika_safe_cmd(self, action):
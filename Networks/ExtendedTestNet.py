@@ -33,30 +33,20 @@ class NetTopo(TopoBase):
         h2 = self.addHost("h2", inNamespace=self.inNamespace)
 
         # Create a OF switch
-        s1 = self.addSwitch("s1")
-        s2 = self.addSwitch("s2")
-        s3 = self.addSwitch("s3")
-        s4 = self.addSwitch("s4")
-        s5 = self.addSwitch("s5")
-        s6 = self.addSwitch("s6")
-
-        self.addLink(h1, s1)
-        self.addLink(s1, s2)
-        self.addLink(s1, s4)
-        self.addLink(s1, s6)
-
-        self.addLink(s2, s3)
-        self.addLink(s2, s4)
-        self.addLink(s2, s5)
-
-        self.addLink(s3, h2)
-        self.addLink(s3, s5)
-        self.addLink(s3, s6)
-
-        self.addLink(s4, s5)
-        self.addLink(s4, s6)
-
-        self.addLink(s5, s6)
+        s1, s2, s3, s4, s5, s6 = [self.addSwitch("s%d" % i) for i in range(1, 7)]
+
+        links = [
+            (h1, s1), (s1, s2), (s1, s4), (s1, s6),
+            (s2, s3), (s2, s4), (s2, s5),
+            (s3, h2), (s3, s5), (s3, s6),
+            (s4, s5), (s4, s6),
+            (s5, s6),
+        ]
+
+        # Add the links in a single pass (order defines the port numbers)
+        addLink = self.addLink
+        for src, dst in links:
+            addLink(src, dst)
 
 
 topos = {
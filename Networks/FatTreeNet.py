@@ -44,14 +44,12 @@ class NetTopo(TopoBase):
 
     Attributes:
         k (int): K attribute of FatTree topology (size)
-        CID (int): Current ID of switches (used to generate names)
     """
 
 
     def __init__(self, k=4, inNamespace=True):
         """ Initiate the topology and validate the arguments """
         self.k = k
-        self.CID = 1
 
         if (not k >= 0) or (not k % 2 == 0):
             raise Exception("K has to be a non-negative multiple of two integer!")
@@ -59,18 +57,6 @@ class NetTopo(TopoBase):
         super(NetTopo, self).__init__("FatTree", inNamespace)
 
 
-    def _genSWName(self):
-        """ Generate the name of a fat tree switch. Method will sequentially
-        generate the switches based on `:cls:attr:(CID)`.
-
-        Returns:
-            str: Name of switch in format sw<num> where num is the CID number.
-        """
-        name = "sw%d" % self.CID
-        self.CID += 1
-        return name
-
-
     def build(self):
         """ Construct the k-ary fat tree topology """
         # Create our hosts
@@ -79,41 +65,51 @@ class NetTopo(TopoBase):
 
         # Calculate the topology cherecteristics
         numPods = self.k
-        numEdge = self.k/2
+        numEdge = self.k // 2
         numAggr = numEdge
-        numCore = pow((self.k/2), 2)
+        numCore = numEdge * numEdge
 
-        # Temporary array of initiated switches
-        swCore = []
+        # Switch names (sw<num>) are derived from the switch index. Core switches
+        # are numbered first, followed by the aggregation and edge switches of
+        # each pod.
+        swCore = ["sw%d" % (core + 1) for core in range(numCore)]
         swAggr = []
         swEdge = []
-
-        # Initiate the core switches
-        for core in range(numCore):
-            swCore.append(self.addSwitch(self._genSWName()))
-
-        # Initiate the aggregation switches
         for pod in range(numPods):
-            for aggr in range(numAggr):
-                aggrSW = self.addSwitch(self._genSWName())
-                swAggr.append(aggrSW)
+            base = numCore + pod * (numAggr + numEdge)
+            swAggr.append(["sw%d" % (base + aggr + 1) for aggr in range(numAggr)])
+            swEdge.append(["sw%d" % (base + numAggr + edge + 1) for edge in range(numEdge)])
+
+        # Initiate the switches in name order
+        addSwitch = self.addSwitch
+        for sw in swCore:
+            addSwitch(sw)
+        for pod in range(numPods):
+            for sw in swAggr[pod] + swEdge[pod]:
+                addSwitch(sw)
 
-                # Connect the aggregation to the core switches
-                for core in range(numEdge*aggr, numEdge*(aggr+1)):
-                    self.addLink(aggrSW, swCore[core])
+        # Generate the links of each pod (in order)
+        links = []
+        for pod in range(numPods):
+            podAggr = swAggr[pod]
 
-            # Initiate the edge switches
-            for edge in range(numEdge):
-                edgeSW = self.addSwitch(self._genSWName())
-                swEdge.append(edgeSW)
+            # Connect the aggregation to the core switches
+            for aggr, aggrSW in enumerate(podAggr):
+                links.extend((aggrSW, coreSW) for coreSW in
+                                swCore[numEdge*aggr:numEdge*(aggr+1)])
 
-                # Connect the edge switch to the aggregation switches
-                for aggr in range(numAggr):
-                    self.addLink(edgeSW, swAggr[aggr+(pod*numAggr)])
+            # Connect the edge switch to the aggregation switches
+            for edgeSW in swEdge[pod]:
+                links.extend((edgeSW, aggrSW) for aggrSW in podAggr)
 
         # Connect the two hosts to the first and final pod
-        self.addLink(h1, swEdge[0])
-        self.addLink(h2, swEdge[len(swEdge)-1])
+        links.append((h1, swEdge[0][0]))
+        links.append((h2, swEdge[-1][-1]))
+
+        # Add the links in a single pass (order defines the port numbers)
+        addLink = self.addLink
+        for src, dst in links:
+            addLink(src, dst)
 
 
 topos = {
@@ -18,13 +18,53 @@ sys.path.append(os.path.abspath("."))
 
 from mininet.node import RemoteController, OVSSwitch
 from TopoBase import TopoBase, CustomCtrlSw
-from mininet.link import TCLink
 
 
 class NetTopo(TopoBase):
     """ Class that creates a Simple topology."""
 
 
+    # Links of the topology in format (src, dst) or (src, dst, bw). Links with
+    # a bandwidth are TCLinks limited to that bandwidth.
+    LINKS = [
+        # Connect the switches to the hosts
+        ("h1", "s1"),
+        ("h2", "s2"),
+        ("h3", "s3"),
+        ("h4", "s4"),
+        ("h5", "s5"),
+        ("h8", "s8"),
+        ("h9", "s9"),
+
+        # Connect the controllers together
+        ("s1", "s2", 1000),
+        ("s1", "s3", 1000),
+        ("s2", "s3", 1000),
+
+        ("s4", "s5", 1000),
+        ("s4", "s6", 1000),
+        ("s5", "s6", 1000),
+        ("s5", "s7", 1000),
+        ("s6", "s7", 1000),
+
+        ("s8", "s9", 1000),
+
+        # Interdomain links
+        ("s2", "s4", 200),
+        ("s2", "s6", 500),
+        ("s5", "s8", 200),
+        ("s5", "s9", 200),
+    ]
+
+
+    # Switches bound to each controller in format {<ctrl>: [<sw>, ...]}
+    CTRLS = {
+        "c1": ["s1", "s2", "s3"],
+        "c2": ["s4", "s5", "s6", "s7"],
+        "c3": ["s8", "s9"],
+    }
+
+
     def __init__(self, inNamespace=True):
         super(NetTopo, self).__init__("TestNet", inNamespace)
 
@@ -32,52 +72,14 @@ class NetTopo(TopoBase):
     def build(self):
         """ Build the test net topology """
         # Create our hosts
-        h1 = self.addHost("h1", inNamespace=self.inNamespace)
-        h2 = self.addHost("h2", inNamespace=self.inNamespace)
-        h3 = self.addHost("h3", inNamespace=self.inNamespace)
-        h4 = self.addHost("h4", inNamespace=self.inNamespace)
-        h5 = self.addHost("h5", inNamespace=self.inNamespace)
-        h8 = self.addHost("h8", inNamespace=self.inNamespace)
-        h9 = self.addHost("h9", inNamespace=self.inNamespace)
+        self.add_hosts(["h1", "h2", "h3", "h4", "h5", "h8", "h9"])
 
         # Create a OF switch
-        s1 = self.addSwitch("s1", cls=CustomCtrlSw)
-        s2 = self.addSwitch("s2", cls=CustomCtrlSw)
-        s3 = self.addSwitch("s3", cls=CustomCtrlSw)
-        s4 = self.addSwitch("s4", cls=CustomCtrlSw)
-        s5 = self.addSwitch("s5", cls=CustomCtrlSw)
-        s6 = self.addSwitch("s6", cls=CustomCtrlSw)
-        s7 = self.addSwitch("s7", cls=CustomCtrlSw)
-        s8 = self.addSwitch("s8", cls=CustomCtrlSw)
-        s9 = self.addSwitch("s9", cls=CustomCtrlSw)
+        self.add_switches(["s%d" % i for i in range(1, 10)], cls=CustomCtrlSw,
+                batch=True)
 
-        # Connect the switches to the hosts
-        self.addLink(h1, s1)
-        self.addLink(h2, s2)
-        self.addLink(h3, s3)
-        self.addLink(h4, s4)
-        self.addLink(h5, s5)
-        self.addLink(h8, s8)
-        self.addLink(h9, s9)
-
-        # Connect the controllers together
-        self.addLink(s1, s2, cls=TCLink, bw=1000)
-        self.addLink(s1, s3, cls=TCLink, bw=1000)
-        self.addLink(s2, s3, cls=TCLink, bw=1000)
-
-        self.addLink(s4, s5, cls=TCLink, bw=1000)
-        self.addLink(s4, s6, cls=TCLink, bw=1000)
-        self.addLink(s5, s6, cls=TCLink, bw=1000)
-        self.addLink(s5, s7, cls=TCLink, bw=1000)
-        self.addLink(s6, s7, cls=TCLink, bw=1000)
-
-        self.addLink(s8, s9, cls=TCLink, bw=1000)
-
-        # Interdomain links
-        self.addLink(s2, s4, cls=TCLink, bw=200)
-        self.addLink(s2, s6, cls=TCLink, bw=500)
-        self.addLink(s5, s8, cls=TCLink, bw=200)
-        self.addLink(s5, s9, cls=TCLink, bw=200)
+        # Connect the hosts and switches
+        self.add_links(self.LINKS)
 
 
     def pre_net_start(self, net):
@@ -87,25 +89,7 @@ class NetTopo(TopoBase):
         c3 = net.addController("c3", controller=RemoteController, ip="127.0.0.13", port=6633)
 
         # Bind the switches to specific controllers
-        s1 = net.get("s1")
-        s2 = net.get("s2")
-        s3 = net.get("s3")
-        s4 = net.get("s4")
-        s5 = net.get("s5")
-        s6 = net.get("s6")
-        s7 = net.get("s7")
-        s8 = net.get("s8")
-        s9 = net.get("s9")
-
-        s1.add_ctrl("c1")
-        s2.add_ctrl("c1")
-        s3.add_ctrl("c1")
-        s4.add_ctrl("c2")
-        s5.add_ctrl("c2")
-        s6.add_ctrl("c2")
-        s7.add_ctrl("c2")
-        s8.add_ctrl("c3")
-        s9.add_ctrl("c3")
+        self.add_ctrls(net, self.CTRLS)
 
 
 topos = {
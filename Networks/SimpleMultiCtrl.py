@@ -15,31 +15,15 @@ sys.path.append(os.path.abspath("."))
 
 from mininet.node import RemoteController
 
-from TopoBase import TopoBase
+from Simple import NetTopo as SimpleTopo
 
 
-class NetTopo(TopoBase):
-    """ Class that creates a Simple topology."""
+class NetTopo(SimpleTopo):
+    """ Class that creates a Simple topology with multiple controllers. The
+    hosts, switch and links are built by `:cls:(Simple.NetTopo)`.
+    """
 
 
-    def __init__(self, inNamespace=True):
-        super(NetTopo, self).__init__("TestNet", inNamespace)
-
-
-    def build(self):
-        """ Build the test net topology """
-        # Create our hosts
-        h1 = self.addHost("h1", inNamespace=self.inNamespace)
-        h2 = self.addHost("h2", inNamespace=self.inNamespace)
-
-        # Create a OF switch
-        s1 = self.addSwitch("s1")
-
-        # XXX: OVS switch dosen't work in namespace so switches
-        # have to be exposed (inNamespace=True)
-        self.addLink(h1, s1)
-        self.addLink(s1, h2)
-
     def pre_net_start(self, net):
         """ Add controllers before the topology starts """
         c1 = net.addController("c1", controller=RemoteController, ip="127.0.0.1", port=6633)
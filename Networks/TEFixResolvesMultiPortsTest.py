@@ -30,10 +30,8 @@ class NetTopo(TopoBase):
 
     def build(self):
         # Create our hosts
-        h1 = self.addHost("h1", inNamespace=self.inNamespace, ip="10.0.1.1/24")
-        h2 = self.addHost("h2", inNamespace=self.inNamespace, ip="10.0.2.1/24")
-        h3 = self.addHost("h3", inNamespace=self.inNamespace, ip="10.0.3.1/24")
-        h4 = self.addHost("h4", inNamespace=self.inNamespace, ip="10.0.4.1/24")
+        h1, h2, h3, h4 = [self.addHost("h%d" % i, inNamespace=self.inNamespace,
+                ip="10.0.%d.1/24" % i) for i in range(1, 5)]
 
         # Create OF switches
         s1 = self.addSwitch("s1")
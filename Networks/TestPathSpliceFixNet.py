@@ -29,14 +29,8 @@ class NetTopo(TopoBase):
         h2 = self.addHost("h2", inNamespace=self.inNamespace)
 
         # Create a OF switch
-        s1 = self.addSwitch("s1")
-        s2 = self.addSwitch("s2")
-        s3 = self.addSwitch("s3")
-        s4 = self.addSwitch("s4")
-        s5 = self.addSwitch("s5")
-        s6 = self.addSwitch("s6")
-        s7 = self.addSwitch("s7")
-        s8 = self.addSwitch("s8")
+        s1, s2, s3, s4, s5, s6, s7, s8 = self.add_switches(
+                ["s%d" % i for i in range(1, 9)])
 
         self.addLink(h1, s1)
         self.addLink(s1, s2)
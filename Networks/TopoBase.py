@@ -16,6 +16,7 @@ from mininet.topo import Topo
 from mininet.log import info, lg
 
 from mininet.node import OVSSwitch
+from mininet.link import TCLink
 
 
 class CustomCtrlSw(OVSSwitch):
@@ -43,13 +44,8 @@ class CustomCtrlSw(OVSSwitch):
         """
         # Based on the name of controllers the switch connects to, find all
         # controller instances to pass to the start function
-        ctrls = []
-        for c in self.ctrls:
-            for cobj in controllers:
-                if cobj.name == c:
-                    # Found the controller instance, move to next name
-                    ctrls.append(cobj)
-                    break
+        by_name = dict((cobj.name, cobj) for cobj in controllers)
+        ctrls = [by_name[c] for c in self.ctrls if c in by_name]
 
         # XXX: Sanity check, make sure we found instances for all controllers
         if not len(ctrls) == len(self.ctrls):
@@ -81,6 +77,9 @@ class TopoBase(Topo):
         inNamespace (bool): Start the hosts in a namespace.
     """
 
+    # Maximum number of ovs-ofctl processes to run at once when dumping the tables
+    DUMP_PROCS = 32
+
 
     def __init__(self, name, inNamespace=True):
         """ Initiate the topology. Save the custom attributes.
@@ -94,6 +93,78 @@ class TopoBase(Topo):
         super(TopoBase, self).__init__()
 
 
+    def add_hosts(self, names, **opts):
+        """ Add a list of hosts to the topology. Hosts are started in a namespace
+        based on `:cls:attr:(inNamespace)`. Names are interned so generated names
+        share the same object as the name literals of the link table.
+
+        Args:
+            names (list of str): Names of the hosts to add
+            **opts: Extra host options shared by all hosts
+
+        Returns:
+            list of str: Names of the added hosts
+        """
+        opts.setdefault("inNamespace", self.inNamespace)
+        addHost = self.addHost
+        return [addHost(intern(name), **opts) for name in names]
+
+
+    def add_switches(self, names, **opts):
+        """ Add a list of switches to the topology. Names are interned (see
+        `:cls:(add_hosts)`).
+
+        Args:
+            names (list of str): Names of the switches to add
+            **opts: Extra switch options shared by all switches (i.e. cls)
+
+        Returns:
+            list of str: Names of the added switches
+        """
+        addSwitch = self.addSwitch
+        return [addSwitch(intern(name), **opts) for name in names]
+
+
+    def add_links(self, links, cls=TCLink):
+        """ Add a table of links to the topology in order. Links with a bandwidth
+        are created as `cls` links limited to that bandwidth, while links without
+        one use the default link class.
+
+        Args:
+            links (list of tuple): Links in format (<src>, <dst>) or (<src>, <dst>, <bw>)
+            cls (mininet.link.Link): Class of links with a bandwidth. Defaults to TCLink.
+        """
+        addLink = self.addLink
+        opts_bw = {}
+        for link in links:
+            if len(link) == 2:
+                addLink(link[0], link[1])
+                continue
+
+            src, dst, bw = link
+            opts = opts_bw.get(bw)
+            if opts is None:
+                opts = {"cls": cls, "bw": bw}
+                opts_bw[bw] = opts
+            addLink(src, dst, **opts)
+
+
+    def add_ctrls(self, net, mapping):
+        """ Bind switches of a running network to their controllers. Switches
+        should be `:cls:(CustomCtrlSw)` instances. To issue the OVS controller
+        configuration of all switches as a single ovs-vsctl call on start, add
+        the switches with the option `batch=True`.
+
+        Args:
+            net (mininet.net.Mininet): Network instance
+            mapping (dict): Switches to bind to each controller in format
+                {<ctrl>: [<sw>, ...]}
+        """
+        for ctrl, switches in mapping.iteritems():
+            for sw in switches:
+                net.get(sw).add_ctrl(ctrl)
+
+
     def hosts_attr(self, net):
         """ Retrieve the hosts attributes list.
 
@@ -130,35 +201,88 @@ class TopoBase(Topo):
             return
 
         info("Configuring topology device attributes\n")
+        hosts = []
         for h in self.hosts():
             host = net.get(h)
-            ip = host.IP().split(".")
-            ip = ".".join(host.IP().split(".")[0:3])
+            ip = host.IP().rsplit(".", 1)[0]
             intf = host.intfNames()[0]
 
             cmd = "ip route add default via %s.254 dev %s" % (ip, intf)
             info("Setting default route on host %s\n\t%s\n" % (h, cmd))
-            host.cmd(cmd)
+            host.sendCmd(cmd)
+            hosts.append(host)
+
+        # Wait for the commands, which run in the host shells concurrently
+        for host in hosts:
+            host.waitOutput()
 
         info("Finished\n")
 
 
-    def dump_tables(self, dump_groups=False):
+    def dump_tables(self, dump_groups=False, flow_filter=None):
         """ Dump all flows and groups (if `dump_groups` is True) to STDOUT.
 
         Args:
             dump_groups (bool): Should we also output the group table. Defaults to False.
+            flow_filter (str): Only dump flows that match this ovs-ofctl flow expression
+                (i.e. "table=1,arp"). Defaults to None (dump all flows).
         """
+        switches = self.switches()
+
         lg.critical("--- DUMP FLOWS ---\n")
-        for sw in self.switches():
+        for sw, out in self._ofctl_dump("dump-flows", switches, flow_filter):
             lg.critical("%s: \n" % sw)
-            lg.critical(subprocess.check_output(["ovs-ofctl", "dump-flows", "-O", "OpenFlow13", sw]))
+            for line in out:
+                lg.critical(line)
         lg.critical("-----------------\n")
 
         if dump_groups:
             lg.critical("--- DUMP GROUPS ---\n")
-            for sw in self.switches():
+            for sw, out in self._ofctl_dump("dump-groups", switches):
                 lg.critical("%s: " % sw)
-                lg.critical(subprocess.check_output(["ovs-ofctl", "dump-groups", "-O",
-                                                "OpenFlow13", sw]))
+                for line in out:
+                    lg.critical(line)
             lg.critical("-----------------\n")
+
+
+    def _ofctl_dump(self, cmd, switches, arg=None):
+        """ Run the ovs-ofctl command `cmd` on all `switches`. Up to `:cls:attr:(DUMP_PROCS)`
+        processes are run concurrently. The output of each switch is streamed rather than
+        read into memory, processes later in the order block until their output is read.
+
+        Args:
+            cmd (str): ovs-ofctl command to run (i.e. dump-flows)
+            switches (list of str): Names of the switches to run the command on
+            arg (str): Optional argument added after the switch name (i.e. a flow filter)
+
+        Yields:
+            (str, file): Switch name and output stream of its command in order of
+                `switches`. The stream has to be consumed before the next item.
+
+        Raises:
+            subprocess.CalledProcessError: A command exited with a non-zero status
+        """
+        for i in range(0, len(switches), self.DUMP_PROCS):
+            procs = []
+            try:
+                for sw in switches[i:i+self.DUMP_PROCS]:
+                    args = ["ovs-ofctl", cmd, "-O", "OpenFlow13", sw]
+                    if arg is not None:
+                        args.append(arg)
+                    procs.append((sw, args, subprocess.Popen(args, stdout=subprocess.PIPE)))
+
+                for sw, args, proc in procs:
+                    yield sw, proc.stdout
+
+                    # Drain any output the caller did not read so the process can exit
+                    proc.stdout.read()
+                    proc.stdout.close()
+                    if proc.wait():
+                        raise subprocess.CalledProcessError(proc.returncode, args)
+            finally:
+                # If a command failed or the caller raised or stopped iterating, close
+                # the output of the remaining processes (unblocking them) and reap them
+                for sw, args, proc in procs:
+                    if not proc.stdout.closed:
+                        proc.stdout.close()
+                    proc.wait()
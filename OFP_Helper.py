@@ -4,11 +4,46 @@
 OF matches and actions based on the datapath OF version of the switch.
 """
 
+import itertools
+
 from ryu.ofproto import ether
 from ryu.lib.packet import lldp
 from ryu.ofproto import ofproto_v1_3_parser
 
 
+# Cache of parser objects (matches, actions and instructions) built by the helpers,
+# keyed by the parser, class name and arguments. Ryu does not modify these objects
+# when serializing them, so a single instance is shared by all rules installed on
+# switches that use the same parser (OF version). The helpers always return new
+# lists so callers can safely extend the result.
+_cache = {}
+
+# Source of the IDs of bundles sent by `:mod:(install_bundle)`
+_bundle_ids = itertools.count(1)
+
+
+def _parser_obj(dp, cls, *args, **kwargs):
+    """ Retrieve a cached instance of the parser class `cls` built with the
+    arguments `args` and `kwargs`, constructing it on first use.
+
+    Args:
+        dp (controller.Datapath): Switch datapath
+        cls (str): Name of the class of the datapath parser to instantiate
+        *args: Positional arguments of the object
+        **kwargs: Keyword arguments of the object
+
+    Returns:
+        obj: Parser object instance
+    """
+    parser = dp.ofproto_parser
+    key = (parser, cls, args, tuple(sorted(kwargs.items())))
+    obj = _cache.get(key)
+    if obj is None:
+        obj = getattr(parser, cls)(*args, **kwargs)
+        _cache[key] = obj
+    return obj
+
+
 def match(dp, vlan=None, in_port=None, ipv4_dst=None, arp=False):
     """ Create an OpenFlow match that will match on either
     VID `vlan` and or in port `in_port`.
@@ -35,7 +70,7 @@ def match(dp, vlan=None, in_port=None, ipv4_dst=None, arp=False):
     if arp == True:
         match_fields["eth_type"] = ether.ETH_TYPE_ARP
 
-    return dp.ofproto_parser.OFPMatch(**match_fields)
+    return _parser_obj(dp, "OFPMatch", **match_fields)
 
 
 def vid_present(dp, vlan):
@@ -62,8 +97,8 @@ def do_push_vlan(dp, vlan):
         List of OFPAction: Push VLAN action list
     """
     return [
-        dp.ofproto_parser.OFPActionPushVlan(ether.ETH_TYPE_8021Q),
-        dp.ofproto_parser.OFPActionSetField(vlan_vid=vid_present(dp, vlan))
+        _parser_obj(dp, "OFPActionPushVlan", ether.ETH_TYPE_8021Q),
+        _parser_obj(dp, "OFPActionSetField", vlan_vid=vid_present(dp, vlan))
     ]
 
 
@@ -76,7 +111,7 @@ def do_pop_vlan(dp):
     Returns:
         List of OFPAction: Pop VLAN action list
     """
-    return [dp.ofproto_parser.OFPActionPopVlan()]
+    return [_parser_obj(dp, "OFPActionPopVlan")]
 
 
 def do_out_port(dp, out_port):
@@ -89,7 +124,7 @@ def do_out_port(dp, out_port):
     Returns:
         List of OFPAction: Output to port action list
     """
-    return [dp.ofproto_parser.OFPActionOutput(out_port)]
+    return [_parser_obj(dp, "OFPActionOutput", out_port)]
 
 
 def do_out_group(dp, out_group):
@@ -102,7 +137,7 @@ def do_out_group(dp, out_group):
     Returns:
         List of OFPAction: Output group action list
     """
-    return [dp.ofproto_parser.OFPActionGroup(out_group)]
+    return [_parser_obj(dp, "OFPActionGroup", out_group)]
 
 
 def do_out_ctrl(dp, buff):
@@ -115,7 +150,7 @@ def do_out_ctrl(dp, buff):
     Returns:
         List of OFPAction: Output to port action list
     """
-    return [dp.ofproto_parser.OFPActionOutput(dp.ofproto.OFPP_CONTROLLER, max_len=buff)]
+    return [_parser_obj(dp, "OFPActionOutput", dp.ofproto.OFPP_CONTROLLER, max_len=buff)]
 
 
 def apply_meter(dp, meter_id):
@@ -128,7 +163,7 @@ def apply_meter(dp, meter_id):
     Returns:
         OFPInsturctionMeter: Meter apply instruction
     """
-    return dp.ofproto_parser.OFPInstructionMeter(meter_id, dp.ofproto.OFPIT_METER)
+    return _parser_obj(dp, "OFPInstructionMeter", meter_id, dp.ofproto.OFPIT_METER)
 
 
 def goto_table(dp, table_id):
@@ -141,7 +176,7 @@ def goto_table(dp, table_id):
     Returns:
         OFPInstructionGotoTable: Go to table instruction
     """
-    return dp.ofproto_parser.OFPInstructionGotoTable(table_id)
+    return _parser_obj(dp, "OFPInstructionGotoTable", table_id)
 
 
 def set_eth_dst(dp, eth_dst):
@@ -154,7 +189,7 @@ def set_eth_dst(dp, eth_dst):
     Returns:
         List of OFPAction: Set the ethernet destination action list
     """
-    return [dp.ofproto_parser.OFPActionSetField(eth_dst=eth_dst)]
+    return [_parser_obj(dp, "OFPActionSetField", eth_dst=eth_dst)]
 
 
 def action(dp, vlan_pop=False, vlan=None, eth_dst=None, out_port=None, out_group=None,
@@ -193,6 +228,40 @@ def action(dp, vlan_pop=False, vlan=None, eth_dst=None, out_port=None, out_group
     return inst
 
 
+def install_bundle(dp, msgs, atomic=True):
+    """ Send a list of modification messages (i.e. flow mods) to a switch as a single
+    bundle that the switch applies on commit. OpenFlow 1.3 switches use the ONF
+    bundle extension (supported by OVS) while newer versions use standard bundles.
+
+    Args:
+        dp (controller.Datapath): Switch datapath
+        msgs (list of MsgBase): Messages to add to the bundle in order
+        atomic (bool): Apply the bundle atomically (all or none of the messages).
+            Defaults to True.
+    """
+    ofp = dp.ofproto
+    parser = dp.ofproto_parser
+    bundle_id = next(_bundle_ids) & 0xFFFFFFFF
+
+    if hasattr(parser, "OFPBundleCtrlMsg"):
+        ctrl_msg = parser.OFPBundleCtrlMsg
+        add_msg = parser.OFPBundleAddMsg
+        open_req = ofp.OFPBCT_OPEN_REQUEST
+        commit_req = ofp.OFPBCT_COMMIT_REQUEST
+        flags = ofp.OFPBF_ATOMIC if atomic else 0
+    else:
+        ctrl_msg = parser.ONFBundleCtrlMsg
+        add_msg = parser.ONFBundleAddMsg
+        open_req = ofp.ONF_BCT_OPEN_REQUEST
+        commit_req = ofp.ONF_BCT_COMMIT_REQUEST
+        flags = ofp.ONF_BF_ATOMIC if atomic else 0
+
+    dp.send_msg(ctrl_msg(dp, bundle_id, open_req, flags, []))
+    for msg in msgs:
+        dp.send_msg(add_msg(dp, bundle_id, flags, msg, []))
+    dp.send_msg(ctrl_msg(dp, bundle_id, commit_req, flags, []))
+
+
 def apply(dp, actions):
     """ Retrieve a OFP apply instructions from a list of `actions`.
 
@@ -218,16 +287,23 @@ def arp_fix_action(dp):
     ofp = dp.ofproto
     parser = dp.ofproto_parser
 
-    return [
-        parser.NXActionRegMove("eth_src_nxm", "eth_dst_nxm", n_bits=48),
-        parser.OFPActionSetField(eth_src="fb:ff:ff:ff:ff:ff"),
-        parser.OFPActionSetField(arp_op=0x2),
-        parser.NXActionRegMove("arp_sha_nxm", "arp_tha_nxm", n_bits=48),
-        parser.OFPActionSetField(arp_sha="fb:ff:ff:ff:ff:ff"),
-        parser.NXActionRegMove("arp_tpa_nxm", "reg0", n_bits=32),
-        parser.NXActionRegMove("arp_spa_nxm", "arp_tpa_nxm", n_bits=32),
-        parser.NXActionRegMove("reg0", "arp_spa_nxm", n_bits=32),
-        parser.OFPActionOutput(ofp.OFPP_IN_PORT)]
+    # The actions are constant so build them once per parser
+    key = (parser, "arp_fix_action")
+    actions = _cache.get(key)
+    if actions is None:
+        actions = [
+            parser.NXActionRegMove("eth_src_nxm", "eth_dst_nxm", n_bits=48),
+            parser.OFPActionSetField(eth_src="fb:ff:ff:ff:ff:ff"),
+            parser.OFPActionSetField(arp_op=0x2),
+            parser.NXActionRegMove("arp_sha_nxm", "arp_tha_nxm", n_bits=48),
+            parser.OFPActionSetField(arp_sha="fb:ff:ff:ff:ff:ff"),
+            parser.NXActionRegMove("arp_tpa_nxm", "reg0", n_bits=32),
+            parser.NXActionRegMove("arp_spa_nxm", "arp_tpa_nxm", n_bits=32),
+            parser.NXActionRegMove("reg0", "arp_spa_nxm", n_bits=32),
+            parser.OFPActionOutput(ofp.OFPP_IN_PORT)]
+        _cache[key] = actions
+
+    return list(actions)
 
 
 # The following methods are used for re-installing the LLDP host discovery rule on the
@@ -244,7 +320,7 @@ def lldp_discovery_match(dp):
     Returns:
         OFPMatch: OpenFlow match field for LLDP host discovery packets
     """
-    return dp.ofproto_parser.OFPMatch(
+    return _parser_obj(dp, "OFPMatch",
                 eth_type=ether.ETH_TYPE_LLDP,
                 eth_dst=lldp.LLDP_MAC_NEAREST_BRIDGE)
 
@@ -259,7 +335,7 @@ def lldp_discovery_action(dp):
     Returns:
         List of OFPAction: Send packet to the controller
     """
-    return [dp.ofproto_parser.OFPActionOutput(dp.ofproto.OFPP_CONTROLLER,
+    return [_parser_obj(dp, "OFPActionOutput", dp.ofproto.OFPP_CONTROLLER,
                                 dp.ofproto.OFPCML_NO_BUFFER)]
 
 
@@ -280,20 +356,22 @@ def match_obj_eq(a, b, parser=None):
         parser = ofproto_v1_3_parser
 
     # Check the two objects instances are correct
-    if (not isinstance(a, parser.OFPMatch) and
+    if (not isinstance(a, parser.OFPMatch) or
             not isinstance(b, parser.OFPMatch)):
         return False
 
     # Check the two objects have the same number of match fields
-    if len(a.items()) != len(b.items()):
+    a_items = a.items()
+    b_items = b.items()
+    if len(a_items) != len(b_items):
         return False
 
     # Validate the two match fields are same for both objects
-    for item in a.items():
-        if item not in b.items():
-            return False
-
-    return True
+    try:
+        return set(a_items) == set(b_items)
+    except TypeError:
+        # Field values are not hashable, compare the fields ordered by name
+        return sorted(a_items) == sorted(b_items)
 
 
 def match_eq(match, fields, parser=None):
@@ -340,7 +418,7 @@ def instruction_eq(a, b, parser=None):
         parser = ofproto_v1_3_parser
 
     # Check if the two instructions share the same type
-    if isinstance(a, type(b)) == False:
+    if type(a) is not type(b):
         return False
 
     # Check if the instructions are lists
@@ -349,9 +427,9 @@ def instruction_eq(a, b, parser=None):
         if not len(a) == len(b):
             return False
 
-        # Order the two lists to make comparisons a lot easier
-        a = sorted(a)
-        b = sorted(b)
+        # Order the two lists by content to make comparisons a lot easier
+        a = sorted(a, key=_instruction_key)
+        b = sorted(b, key=_instruction_key)
 
         # Iterate through the items in both lists and compare
         for index in range(len(a)):
@@ -369,8 +447,8 @@ def instruction_eq(a, b, parser=None):
             return False
 
         # Sort the action lists of both instructions
-        a_actions = sorted(a.actions)
-        b_actions = sorted(b.actions)
+        a_actions = sorted(a.actions, key=_action_key)
+        b_actions = sorted(b.actions, key=_action_key)
 
         # Iterate through the list of actions and check if they are equal
         for index in range(len(a_actions)):
@@ -383,6 +461,33 @@ def instruction_eq(a, b, parser=None):
     return False
 
 
+# Attributes of each action type that are compared by `:mod:(_action_eq)`
+_ACTION_FIELDS = {
+    "OFPActionPushVlan": ("ethertype",),
+    "OFPActionSetField": ("key", "value"),
+    "OFPActionGroup": ("group_id",),
+    "OFPActionOutput": ("port",),
+}
+
+
+def _action_key(act):
+    """ Sort key of an action made up of the action type name and compared fields.
+    Actions are ordered by content so that equal lists sort to the same order.
+    """
+    name = type(act).__name__
+    return (name,) + tuple(getattr(act, f) for f in _ACTION_FIELDS.get(name, ()))
+
+
+def _instruction_key(inst):
+    """ Sort key of an instruction made up of the instruction type name, type and
+    sorted action keys (for instructions with actions).
+    """
+    actions = getattr(inst, "actions", None)
+    if actions is None:
+        return (type(inst).__name__,)
+    return (type(inst).__name__, inst.type, sorted(_action_key(a) for a in actions))
+
+
 def _action_eq(a, b, parser):
     """ Check if two actions are equal. Two actions are qeual if they are of the same type
     and depending on the type, have the same field or values.
@@ -396,11 +501,8 @@ def _action_eq(a, b, parser):
         return True
     # If the action is a set field make sure the key and value match
     elif isinstance(a, parser.OFPActionSetField):
-        if not isinstance(b, parser.OFPActionSetField):
-            return Fals
-        if (not a.key == b.key or not a.value == b.value):
-            return False
-        return True
+        return (isinstance(b, parser.OFPActionSetField) and
+                a.key == b.key and a.value == b.value)
     # If the action is a output to group make sure the groups are the same
     elif isinstance(a, parser.OFPActionGroup):
         if not isinstance(b, parser.OFPActionGroup):
@@ -29,6 +29,16 @@ class ProactiveController(TopoDiscoveryController):
         LOOSE_SPLICE (bool): Static attribute that specifies if loose (true)
             or strict (false) path splices will be computed.
         CONF (oslo_config.cfg): Congif object that contains attributes
+        _path_cache (dict): Primary, secondary and splice paths of host pairs computed
+            for topology version `:cls:attr:(_path_cache_ver)` in format
+            {(src, dest): (path_primary, path_secondary, ports_primary, ports_secondary,
+            splice)}. Only used while `:cls:attr:(_path_cache_on)` is True.
+        _path_cache_ver (int): Topology version of the paths in `:cls:attr:(_path_cache)`
+        _path_cache_on (bool): Flag that indicates if ``compute_path_dict`` should use
+            the path cache (set while computing the host pair paths)
+        _primary_paths (dict): Primary paths of the host pairs of the current source
+            host computed with a single shortest path computation, in format
+            {(src, dest): [path]}. Only used while `:cls:attr:(_path_cache_on)` is True.
     """
     CONTROLLER_NAME = "PROACTIVE"
     LOOSE_SPLICE = False        # COMPUTE STRICT PATH SPLICES
@@ -39,6 +49,10 @@ class ProactiveController(TopoDiscoveryController):
         super(ProactiveController, self).__init__(*args, **kwargs)
         self.__topo_timer = None
         self.paths = {}
+        self._path_cache = {}
+        self._path_cache_ver = None
+        self._path_cache_on = False
+        self._primary_paths = {}
 
         self.CONF.register_opts([
             cfg.BoolOpt("optimise_protection",
@@ -102,16 +116,41 @@ class ProactiveController(TopoDiscoveryController):
                 self._compute_paths(self.graph, None, None, None, None, path_key=hkey)
             return
 
-        for host_1 in self.hosts:
-            for host_2 in self.hosts:
-                if host_1 == host_2:
-                    continue
+        # Host pair paths only depend on the topology, reuse any paths already
+        # computed for the current topology version
+        if self._path_cache_ver != self.graph.topo_version:
+            self._path_cache = {}
+            self._path_cache_ver = self.graph.topo_version
+
+        # Reuse a single copy of the topology for all pairs, restoring the link
+        # costs modified by the previous path computation
+        graph = Graph(self.graph.topo)
+        costs = graph.get_costs()
+
+        self._path_cache_on = True
+        try:
+            for host_1 in self.hosts:
+                # Compute the primary paths from the source to all destinations
+                # without cached paths at once
+                dests = [host_2 for host_2 in self.hosts
+                            if host_2 != host_1 and (host_1, host_2) not in self._path_cache]
+                graph.restore_costs(costs)
+                primary = graph.shortest_paths(host_1, dests)
+                self._primary_paths = dict(((host_1, host_2), path)
+                                            for host_2, path in primary.iteritems())
+
+                for host_2 in self.hosts:
+                    if host_1 == host_2:
+                        continue
 
-                graph = Graph(self.graph.topo)
-                addr = self.graph.get_port_info(host_2, -1)
-                dest_addr = addr["address"]
-                dest_eth = addr["eth_address"]
-                self._compute_paths(graph, host_1, host_2, dest_addr, dest_eth)
+                    graph.restore_costs(costs)
+                    addr = self.graph.get_port_info(host_2, -1)
+                    dest_addr = addr["address"]
+                    dest_eth = addr["eth_address"]
+                    self._compute_paths(graph, host_1, host_2, dest_addr, dest_eth)
+        finally:
+            self._path_cache_on = False
+            self._primary_paths = {}
 
 
     def add_dummy_destination(self, hkey, info, graph):
@@ -138,21 +177,18 @@ class ProactiveController(TopoDiscoveryController):
             # ports that were over-written. If multiple lead to the same just return that target
             rewrote_out = {}
 
-            # Otherwise add a fake name to the end of the graph
+            # Otherwise add a fake name to the end of the graph, named after the
+            # first instruction that uses the output port
             for i in range(len(info)):
-                fake_name = "TARGET%s" % i
-                out_sw = info[i]["out"][0]
-                out_port = info[i]["out"][1]
-
                 # XXX: Fix for multiple instructions using same link
-                if info[i]["out"] in rewrote_out:
-                    ret_target.append(rewrote_out[info[i]["out"]])
-                    continue
+                fake_name = rewrote_out.setdefault(info[i]["out"], "TARGET%s" % i)
+                ret_target.append(fake_name)
 
-                rewrote_out[info[i]["out"]] = fake_name
-                graph.topo[out_sw][out_port]["dest"] = fake_name
+            # Rewrite the links of all output ports and mark the topology stale once
+            for out, fake_name in rewrote_out.iteritems():
+                graph.topo[out[0]][out[1]]["dest"] = fake_name
+            if len(rewrote_out) > 0:
                 graph.topo_stale = True
-                ret_target.append(fake_name)
         return ret_target
 
 
@@ -189,11 +225,16 @@ class ProactiveController(TopoDiscoveryController):
         if info[0]["action"] == "delete":
             return gp, special_flows, ingress_change_ports
 
+        # Compute all backup paths on a single copy of the topology, restoring
+        # the link costs modified by the previous path computation
+        g = Graph(graph.topo)
+        costs = g.get_costs()
+
         # Is this the start segment (source host)?
         if host_1 in self.hosts:
             for i in range(1, len(info)):
                 target = target_names[i]
-                g = Graph(graph.topo)
+                g.restore_costs(costs)
                 dict = self.compute_path_dict(g, host_1, target, path_key=hkey)
                 self.__combine_table(gp, dict["groups"])
                 self.__combine_table(special_flows, dict["special_flows"])
@@ -207,7 +248,7 @@ class ProactiveController(TopoDiscoveryController):
                 # sure path info is correct
                 #target = target_names[i]
                 target = host_2
-                g = Graph(graph.topo)
+                g.restore_costs(costs)
                 dict = self.compute_path_dict(g, info[i]["in"][0], target, path_key=hkey)
                 self.__combine_table(gp, dict["groups"])
                 self.__combine_table(special_flows, dict["special_flows"])
@@ -227,7 +268,7 @@ class ProactiveController(TopoDiscoveryController):
             # Compute the extra group trable for the secondary path(s)
             for i in range(1, len(info)):
                 target = target_names[i]
-                g = Graph(graph.topo)
+                g.restore_costs(costs)
                 dict = self.compute_path_dict(g, info[i]["in"][0], target, path_key=hkey)
                 self.__combine_table(gp, dict["groups"])
                 self.__combine_table(special_flows, dict["special_flows"])
@@ -369,8 +410,25 @@ class ProactiveController(TopoDiscoveryController):
             path_key = (src, dest)
 
         gid = self._get_gid(path_key[0], path_key[1])
-        path_primary, path_secondary, ports_primary, ports_secondary = ppc.find_path(
-                        src, dest, graph, graph_sec, logger=self.logger)
+
+        # Reuse the paths of the pair if already computed for the topology version
+        cache_key = None
+        cached = None
+        if self._path_cache_on and graph_sec is None:
+            cache_key = (src, dest)
+            cached = self._path_cache.get(cache_key)
+
+        if cached is not None:
+            path_primary, path_secondary, ports_primary, ports_secondary, splice = cached
+        else:
+            # Use the primary path computed for all destinations of the source (if
+            # found, otherwise compute it to log the reason)
+            path_primary = None
+            if cache_key is not None:
+                path_primary = self._primary_paths.get(cache_key) or None
+            path_primary, path_secondary, ports_primary, ports_secondary = ppc.find_path(
+                            src, dest, graph, graph_sec, logger=self.logger,
+                            path_primary=path_primary)
 
         self.logger.info("PATH: %s to %s" % (src, dest))
         self.logger.info("PATH PRIMARY: %s" % path_primary)
@@ -385,12 +443,17 @@ class ProactiveController(TopoDiscoveryController):
             graph_sec = graph
 
         # Find the required path splices for our two paths
-        if self.LOOSE_SPLICE == False:
-            splice = ppc.gen_splice(path_primary, path_secondary, graph_sec)
-            splice.update(ppc.gen_splice(path_secondary, path_primary, graph_sec))
-        else:
-            splice = ppc.gen_splice_loose(path_primary, path_secondary, graph_sec)
-            splice.update(ppc.gen_splice_loose(path_secondary, path_primary, graph_sec))
+        if cached is None:
+            if self.LOOSE_SPLICE == False:
+                splice = ppc.gen_splice(path_primary, path_secondary, graph_sec)
+                splice.update(ppc.gen_splice(path_secondary, path_primary, graph_sec))
+            else:
+                splice = ppc.gen_splice_loose(path_primary, path_secondary, graph_sec)
+                splice.update(ppc.gen_splice_loose(path_secondary, path_primary, graph_sec))
+
+            if cache_key is not None:
+                self._path_cache[cache_key] = (path_primary, path_secondary, ports_primary,
+                                            ports_secondary, splice)
 
         self.logger.info("SPLICES: %s" % splice)
 
@@ -391,20 +391,28 @@ class RootCtrl(object):
 
     def _action_inter_domain_link_traffic(self, obj):
         """ Process an inter-domain link traffic update message received from a local controller. If
-        the port exists in the topology update it's TX-rate.
+        the port exists in the topology update it's TX-rate. The message either contains the traffic
+        of a single port ("sw", "port" and "traff_bps") or a batch of port traffic samples in
+        format "samples": [(<sw>, <port>, <traff_bps>), ...].
 
         Args:
             obj (dict): Local controller message
         """
         cid = obj["cid"]
-        self.logger.debug("Got IDL traff from %s (traff_bps: %s)" %
-                                                (cid, obj["traff_bps"]))
-        pinfo = self._graph.get_port_info(obj["sw"], obj["port"])
-        if pinfo is not None:
-            tx_bytes = obj["traff_bps"] / 8.0
-            self._graph.update_port_info(
-                obj["sw"], obj["port"], tx_bytes=tx_bytes, is_total=False
-            )
+        if "samples" in obj:
+            samples = obj["samples"]
+        else:
+            samples = [(obj["sw"], obj["port"], obj["traff_bps"])]
+
+        for sw, port, traff_bps in samples:
+            self.logger.debug("Got IDL traff from %s (traff_bps: %s)" %
+                                                    (cid, traff_bps))
+            pinfo = self._graph.get_port_info(sw, port)
+            if pinfo is not None:
+                tx_bytes = traff_bps / 8.0
+                self._graph.update_port_info(
+                    sw, port, tx_bytes=tx_bytes, is_total=False
+                )
 
     def _action_inter_domain_link_congested(self, obj):
         """ Process a congested inter-domain link message received from a local controller. Update
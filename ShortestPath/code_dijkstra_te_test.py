@@ -144,6 +144,34 @@ class CodeTestDijkstraTe(unittest.TestCase):
                     "Test %d failed, paths are different!" % (t))
 
 
+    def test_shortest_paths(self):
+        """ Test that computing the shortest paths from a node to multiple destinations
+        returns the same paths as ``shortest_path()``. Method checks the paths from p1 for
+        all failure scenarios `:cls:attr:(fail)`.
+        """
+        print("\nShortest paths to multiple destinations test")
+        dests = ["d1", "s3", "s5", "p1", "x1"]
+
+        for i in range(len(self.fail)):
+            self.g.change_topo(self.topo)
+            for link in self.fail[i]:
+                self.g.remove_port(link[0], link[1], link[2], link[3])
+                self.g.remove_port(link[1], link[0], link[3], link[2])
+
+            print("\tChecking scenario %d of %d" % (i + 1, len(self.fail)))
+            res = self.g.shortest_paths("p1", dests)
+            self.assertTrue(_paths_same(res["d1"], self.expected[i]),
+                    "Test %d failed, paths are different!" % (i + 1))
+            for dest in dests:
+                self.assertTrue(_paths_same(res[dest], self.g.shortest_path("p1", dest)),
+                        "Test %d failed, path to %s is different!" % (i + 1, dest))
+
+        # Paths from a inexistent node should all be empty
+        res = self.g.shortest_paths("x1", dests)
+        self.assertEqual(res, dict((dest, []) for dest in dests),
+                "Paths from inexistent node are not empty")
+
+
     def test_host_link_remove(self):
         """ Test the host link remove method of the module """
         print("\nHost link remove test")
@@ -646,6 +674,78 @@ class CodeTestDijkstraTe(unittest.TestCase):
                         "Topo change port should use specified speed value!")
 
 
+    def test_topo_version(self):
+        """ Test that the topology version is incremented when the topology is modified
+        and stays the same if a operation dosen't change the topology.
+        """
+        print("\nChecking topology version changes")
+        ver = self.g.topo_version
+
+        # Re-adding a existing link or updating stats should not change the version
+        self.g.add_link("s1", "s2", 2, 1)
+        self.g.update_port_info("s1", 2, tx_bytes=1000, speed=1000000)
+        self.assertEqual(self.g.topo_version, ver,
+                "Topology version changed without a topology modification")
+
+        # Adding a link, setting host addresses and removing elements should change it
+        self.g.add_link("s5", "s6", 4, 1)
+        self.assertTrue(self.g.topo_version > ver, "Add link did not change version")
+        ver = self.g.topo_version
+
+        # Updating the port info of a new switch or port should change it
+        self.g.update_port_info("s7", 1, speed=1000)
+        self.assertTrue(self.g.topo_version > ver, "New switch port did not change version")
+        self.assertTrue("s7" in self.g.get_switches(), "New switch not in switch list")
+        ver = self.g.topo_version
+        self.g.update_port_info("s7", 2, speed=1000)
+        self.assertTrue(self.g.topo_version > ver, "New port did not change version")
+        ver = self.g.topo_version
+        self.g.update_port_info("s7", 2, speed=2000, tx_bytes=1000)
+        self.assertEqual(self.g.topo_version, ver,
+                "Updating a existing port changed the version")
+
+        self.g.update_port_info("p1", -1, addr="10.0.0.1", eth_addr="00:00:00:00:00:01")
+        self.assertTrue(self.g.topo_version > ver, "Host address did not change version")
+        ver = self.g.topo_version
+        self.g.update_port_info("p1", -1, addr="10.0.0.1", eth_addr="00:00:00:00:00:01")
+        self.assertEqual(self.g.topo_version, ver,
+                "Setting the same host address changed the version")
+
+        self.g.remove_host("p1")
+        self.assertTrue(self.g.topo_version > ver, "Host remove did not change version")
+        ver = self.g.topo_version
+
+        self.g.remove_switch("s5")
+        self.assertTrue(self.g.topo_version > ver, "Switch remove did not change version")
+
+
+    def test_restore_costs(self):
+        """ Test that restoring saved costs undoes cost changes and that the restored
+        graph computes the same paths as before the change.
+        """
+        print("\nChecking restore of link costs")
+        costs = self.g.get_costs()
+        path = self.g.shortest_path("p1", "d1")
+
+        self.g.change_cost("s1", "s2", 2, 1, 100000)
+        self.g.change_cost("s2", "s3", 2, 1, 100000)
+        self.assertNotEqual(self.g.get_costs(), costs, "Change cost did not modify costs")
+        self.assertFalse(_paths_same(self.g.shortest_path("p1", "d1"), path),
+                "Change cost did not modify the path")
+
+        self.g.restore_costs(costs)
+        self.assertEqual(self.g.get_costs(), costs, "Restore did not reset the costs")
+        self.assertTrue(_paths_same(self.g.shortest_path("p1", "d1"), path),
+                "Restored graph computed a different path")
+
+        # Restoring unchanged costs should not modify the topology
+        ver = self.g.topo_version
+        self.g.restore_costs(costs)
+        self.assertEqual(self.g.topo_version, ver,
+                "Restoring unchanged costs changed the version")
+
+
+
 # ----- EXTRA HELPER METHODS ------ #
 
 
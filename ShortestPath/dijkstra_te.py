@@ -2,6 +2,7 @@
 
 import sys
 import copy
+import heapq
 from collections import deque, namedtuple
 
 DEFAULT_COST = 100
@@ -56,8 +57,13 @@ class Graph():
         topo_stale (bool): Flag that indicates if the topo needs to be recomputed
             before perorming a shortest path operation. This flag should be set when
             `:cls:atr:(topo)` is modified.
+        topo_version (int): Counter incremented on every modification of the topology
+            (links, ports, hosts or host addresses). Allows caching information derived
+            from the topology between changes.
         sw (set of str): Switches in the topology (vertex)
         links (list of tuple): Links in the topology (verticies) ``Links``
+        neighbours (dict): Neighbours of each switch built from `:cls:attr:(links)` in
+            format {src id: set((dest id, cost), ...)}
         fixed_speed (dict): Dictionary of fixed speed ports. Format of dict:
             { sw: { port: speed in bits } }
     """
@@ -71,13 +77,16 @@ class Graph():
         """
         self.sw = set()
         self.links = []
+        self.neighbours = {}
         self.fixed_speed = {}
+        self.topo_version = 0
         self.change_topo(topo)
 
 
     def _process_topo(self):
-        """ Process `:cls:attr:(topo)` into a set of switches and a list of link
-        tuples (in format ``Link``) if `:cls:attr:(topo_state)` is True.
+        """ Process `:cls:attr:(topo)` into a set of switches, a list of link
+        tuples (in format ``Link``) and the neighbours of each switch if
+        `:cls:attr:(topo_state)` is True.
         """
         # If the topology is not stale do not re-process the topology
         if self.topo_stale == False:
@@ -86,6 +95,7 @@ class Graph():
         # Clear the set of switches and links array
         self.sw = set()
         self.links = []
+        self.neighbours = {}
 
         # Generate the link array as a list of tuples made up
         # of (src switch id, des switch id, cost)
@@ -104,6 +114,13 @@ class Graph():
 
             self.sw.add(sw_id)
 
+        # Build the neighbours of each switch once per topology change rather than
+        # for every shortest path computation
+        neighbours = {s: set() for s in self.sw}
+        for start, end, cost in self.links:
+            neighbours[start].add((end, cost))
+        self.neighbours = neighbours
+
         # Mark the topology as being processed (not stale)
         self.topo_stale = False
 
@@ -142,6 +159,7 @@ class Graph():
             self.topo = {}
 
         self.topo_stale = True
+        self.topo_version += 1
 
 
     def add_link(self, src, dst, src_port, dst_port, cost=DEFAULT_COST):
@@ -170,11 +188,13 @@ class Graph():
         self.topo[src][src_port]["destPort"] = dst_port
         self.topo[src][src_port]["cost"] = cost
         self.topo_stale = True
+        self.topo_version += 1
         return True
 
 
     def _init_port(self, src, src_port):
         """ Initiate a new port dictionary entry if one dosen't exist for `src` and `src_port`.
+        `:cls:attr:(topo_version)` is incremented if a new switch or port entry is created.
 
         Args:
             src (obj): Source ID of the switch
@@ -182,6 +202,7 @@ class Graph():
         """
         if src not in self.topo:
             self.topo[src] = {}
+            self.topo_version += 1
 
         if src_port not in self.topo[src]:
             # If the port has a fixed speed set it to that value
@@ -192,6 +213,7 @@ class Graph():
             self.topo[src][src_port] = {
                 "dest": None, "destPort": None, "cost": DEFAULT_COST, "speed": speed
             }
+            self.topo_version += 1
 
 
     def update_port_info(self, src, src_port, speed=None, rx_packets=None, rx_bytes=None,
@@ -223,10 +245,12 @@ class Graph():
             if not src in self.fixed_speed or not src_port in self.fixed_speed[src]:
                 d["speed"] = speed
 
-        if addr is not None:
+        if addr is not None and d.get("address") != addr:
             d["address"] = addr
-        if eth_addr is not None:
+            self.topo_version += 1
+        if eth_addr is not None and d.get("eth_address") != eth_addr:
             d["eth_address"] = eth_addr
+            self.topo_version += 1
 
         # If we have no stats update just exit early
         if (rx_packets is None and rx_bytes is None and rx_rate is None and
@@ -276,6 +300,43 @@ class Graph():
         return self.topo[src][src_port]
 
 
+    def get_host_port_info_bulk(self, hosts):
+        """ Retrieve the ethernet and IP address of a list of hosts from `:cls:attr:(topo)`
+        in a single pass.
+
+        Args:
+            hosts (list of obj): IDs of the hosts to get the address info of
+
+        Returns:
+            list of tuple: (eth_address, address) of each host in `hosts` (same order)
+        """
+        topo = self.topo
+        res = []
+        for h in hosts:
+            info = topo[h][-1]
+            res.append((info["eth_address"], info["address"]))
+        return res
+
+
+    def get_port_speed_bulk(self, ports):
+        """ Retrieve the speed of a list of ports from `:cls:attr:(topo)` in a single pass.
+        Ports that do not exist in the topology are not included in the result.
+
+        Args:
+            ports (list of tuple): (<sw>, <port>) pairs to get the speed of
+
+        Returns:
+            dict: Speed of the ports in format {(<sw>, <port>): <speed>}
+        """
+        topo = self.topo
+        res = {}
+        for sw, port in ports:
+            sw_ports = topo.get(sw)
+            if sw_ports is not None and port in sw_ports:
+                res[(sw, port)] = sw_ports[port]["speed"]
+        return res
+
+
     def remove_port(self, src, dst, src_port, dst_port):
         """ Remove a port from the topology. If the specified port exists, it will be
         deleted from `:cls:attr:(topo)` and `:cls:attr:(topo_stale)` set to True.
@@ -301,6 +362,7 @@ class Graph():
 
         # Remove the link and set the topology as stale
         self.topo_stale = True
+        self.topo_version += 1
         del self.topo[src][src_port]
         return True
 
@@ -327,6 +389,7 @@ class Graph():
 
         # Delete the switch end of the link and make topo stale
         self.topo_stale = True
+        self.topo_version += 1
         host = self.topo[src][src_port]["dest"]
         del self.topo[src][src_port]
 
@@ -358,6 +421,7 @@ class Graph():
             del self.topo[id]
             cahnged = True
             self.topo_stale = True
+            self.topo_version += 1
 
         # Iterate through all switches and ports
         delete = []
@@ -371,6 +435,8 @@ class Graph():
 
         for d in delete:
             del self.topo[d[0]][d[1]]
+        if len(delete) > 0:
+            self.topo_version += 1
 
         # Return weather or not a change was performed
         return changed
@@ -447,6 +513,7 @@ class Graph():
 
         self.topo[src][src_port]["cost"] = cost
         self.topo_stale = True
+        self.topo_version += 1
 
         # Check if the reverse exists and if it does update the cost
         if (dst not in self.topo or dst_port not in self.topo[dst] or
@@ -457,6 +524,42 @@ class Graph():
         self.topo[dst][dst_port]["cost"] = cost
 
 
+    def get_costs(self):
+        """ Retrieve the cost of all ports in `:cls:attr:(topo)`. The returned costs
+        can be passed to ``restore_costs()`` to undo cost changes made when computing
+        paths, allowing a single graph to be reused rather than copied for each
+        computation.
+
+        Returns:
+            dict: Cost of ports in format {(src, src_port): cost}
+        """
+        costs = {}
+        for src,src_val in self.topo.iteritems():
+            for port,port_val in src_val.iteritems():
+                costs[(src, port)] = port_val["cost"]
+        return costs
+
+
+    def restore_costs(self, costs):
+        """ Restore the port costs of `:cls:attr:(topo)` to the values in `costs`
+        (retrieved using ``get_costs()``). `:cls:attr:(topo_stale)` is set to True
+        if any cost was modified.
+
+        Args:
+            costs (dict): Cost of ports in format {(src, src_port): cost}
+        """
+        changed = False
+        for (src, port),cost in costs.iteritems():
+            port_val = self.topo[src][port]
+            if not port_val["cost"] == cost:
+                port_val["cost"] = cost
+                changed = True
+
+        if changed:
+            self.topo_stale = True
+            self.topo_version += 1
+
+
     def find_ports(self, src_id, dst_id):
         """ Find a port pair that connects two switches in `:cls:attr:(topo)`.
         Method finds the ports used by a link between `src_id` and `dst_id`
@@ -559,49 +662,114 @@ class Graph():
             return []
 
         try:
-            # Create a set of switches to process
-            q = self.sw.copy()
-
-            # Initiate the cost array to infinity
-            dist = {s: sys.maxint for s in self.sw}
-            # Initiate the previous node in optimal path to none
-            prev = {s: None for s in self.sw}
-            # Set the cost of the start node to 0
-            dist[src] = 0
-
-            # Create a set of neighbours
-            neighbours = {s: set() for s in self.sw}
-            for start, end, cost in self.links:
-                neighbours[start].add((end, cost))
-
-            # While Q is not empty
-            while q:
-                # get the node with the least distance
-                u = min(q, key=lambda s: dist[s])
-                q.remove(u)
-
-                # If the cost is inf or we have reached our destination
-                if dist[u] == sys.maxint or u == dest:
-                    break
-
-                # For all of the neighbours fo the link
-                for v, cost in neighbours[u]:
-                    alt = dist[u] + cost
-                    # Check if the new node distance is better or its ID is
-                    # lower, if so update the previous node
-                    if alt < dist[v] or (alt == dist[v] and u < prev[v]):
-                        dist[v] = alt
-                        prev[v] = u
-
-            # Get the shortest path as from start to end
-            s = deque()
-            u = dest
-            while prev[u]:
-                s.appendleft(u)
-                u = prev[u]
-            s.appendleft(u)
+            prev = self._dijkstra(src, dest)
         except Exception:
             return []
+        return self._tree_path(prev, src, dest)
+
+
+    def shortest_paths(self, src, dests):
+        """ Compute the shortest paths from `src` to every node in `dests`. A single
+        dijkstra computation is performed from `src`, returning the same paths as
+        calling ``shortest_path()`` for each destination.
+
+        Args:
+            src (obj): Start of the paths (switch or host)
+            dests (list of obj): Destinations of the paths (switches or hosts)
+
+        Returns:
+            dict: Path to each destination in format {dest: [path]}. A destination
+                maps to a empty list if a path can't be computed.
+        """
+        if self.topo_stale == True:
+            self._process_topo()
+
+        prev = None
+        if src in self.sw:
+            try:
+                prev = self._dijkstra(src)
+            except Exception:
+                pass
+
+        paths = {}
+        for dest in dests:
+            if prev is None or dest not in self.sw:
+                paths[dest] = []
+            else:
+                paths[dest] = self._tree_path(prev, src, dest)
+        return paths
+
+
+    def _dijkstra(self, src, dest=None):
+        """ Run dijkstras algorithm from `src` until `dest` is reached, or all nodes
+        were processed if `dest` is None. See ``shortest_path()`` for the tie breaker.
+
+        Args:
+            src (obj): Start node of the computation (has to be in `:cls:attr:(sw)`)
+            dest (obj): Optional node to stop the computation at. Defaults to None.
+
+        Returns:
+            dict: Previous node in the shortest path to each node, {node: prev node}
+        """
+        # Initiate the cost array to infinity
+        dist = {s: sys.maxint for s in self.sw}
+        # Initiate the previous node in optimal path to none
+        prev = {s: None for s in self.sw}
+        # Set the cost of the start node to 0
+        dist[src] = 0
+        neighbours = self.neighbours
+
+        # Queue of (distance, node) to process. Nodes are re-added when their
+        # distance decreases, the outdated entries are skipped when popped.
+        # Unreachable nodes are never added.
+        q = [(0, src)]
+        done = set()
+
+        # While Q is not empty
+        while q:
+            # get the node with the least distance
+            d, u = heapq.heappop(q)
+            if u in done:
+                continue
+            done.add(u)
+
+            # If we have reached our destination
+            if u == dest:
+                break
+
+            # For all of the neighbours fo the link
+            for v, cost in neighbours[u]:
+                alt = d + cost
+                # Check if the new node distance is better or its ID is
+                # lower, if so update the previous node
+                if alt < dist[v]:
+                    dist[v] = alt
+                    prev[v] = u
+                    heapq.heappush(q, (alt, v))
+                elif alt == dist[v] and u < prev[v]:
+                    prev[v] = u
+        return prev
+
+
+    def _tree_path(self, prev, src, dest):
+        """ Get the path from `src` to `dest` using the previous nodes `prev` computed
+        by ``_dijkstra()``.
+
+        Args:
+            prev (dict): Previous node in the shortest path to each node
+            src (obj): Start of the path
+            dest (obj): Destination of the path
+
+        Returns:
+            list of obj: Nodes in the path or empty list if `dest` not reachable
+        """
+        # Get the shortest path as from start to end
+        s = deque()
+        u = dest
+        while prev[u]:
+            s.appendleft(u)
+            u = prev[u]
+        s.appendleft(u)
 
         # Return the path or a empty list if the src or dst is not in the result
         res = list(s)
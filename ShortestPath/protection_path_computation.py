@@ -83,6 +83,7 @@ def gen_splice(path_primary, path_secondary, g):
         shortest = []
         shortest_proximity = 10000
 
+        targets = []
         for sw_sec in path_secondary:
             # XXX: IGNORE ANY TEMPORARY NODES ADDED FOR INTER- AREA PATHS
             if isinstance(sw_sec, str) and sw_sec.startswith("*"):
@@ -93,10 +94,13 @@ def gen_splice(path_primary, path_secondary, g):
             # primary path overlap).
             if (sw == sw_sec or sw_sec in path_primary):
                 continue
+            targets.append(sw_sec)
 
-            # Try to find the path between the nodes and check if
-            # shortest path
-            path = g.shortest_path(sw, sw_sec)
+        # Find the paths to all splice targets with a single computation
+        paths = g.shortest_paths(sw, targets)
+        for sw_sec in targets:
+            # Check if the path is the shortest
+            path = paths[sw_sec]
 
             # Find the proximity of the splice to the destination
             prox = 10000
@@ -181,6 +185,7 @@ def gen_splice_loose(path_primary, path_secondary, g):
         #print("SEARCH SW %s" % sw)
 
         # Go through nodes in the secondary path to find splice destinations
+        targets = []
         for sw_sec in path_secondary:
             # Do not compute a path splice to ourselves or to a non unique
             # node in the primary path. Allow computing to adjacent nodes.
@@ -190,9 +195,12 @@ def gen_splice_loose(path_primary, path_secondary, g):
                 continue
 
             #print("\tNODE_OK %s %s" % (sw, sw_sec))
+            targets.append(sw_sec)
 
-            # Try compute the shortest path between the nodes
-            path = g.shortest_path(sw, sw_sec)
+        # Compute the shortest paths to all splice destinations at once
+        paths = g.shortest_paths(sw, targets)
+        for sw_sec in targets:
+            path = paths[sw_sec]
 
             # Check if any links are part of the primary or secondary path
             invalid_link = False
@@ -253,7 +261,7 @@ def increase_used_edge_cost(graph, ports):
         graph.change_cost(src, dst, src_port, dst_port, 100000)
 
 
-def find_path(src, dest, graph, graph_sec=None, logger=None):
+def find_path(src, dest, graph, graph_sec=None, logger=None, path_primary=None):
     """ Compute a primary and secondary path between `src` to `dest` in
     topology `graph`. Method computes two shortest minimally overlapping paths.
     A minimally overlapping secondary path is computed by setting the weights
@@ -275,6 +283,10 @@ def find_path(src, dest, graph, graph_sec=None, logger=None):
         graph_sec (Graph): Optional topology graph to use for computing the
             secondary path. Defaults to null (use `graph` to compute both
             primary and secondary path).
+        logger (Logger): Output debug and error info if provided. Defaults to None.
+        path_primary (list of str): Optional primary path already computed on
+            `graph` (i.e. using ``Graph.shortest_paths()``). Defaults to None
+            (compute the primary path).
 
 
     Returns:
@@ -283,8 +295,9 @@ def find_path(src, dest, graph, graph_sec=None, logger=None):
             triples in format (node, in port, out port) in the primary and
             secondary path.
     """
-    # Compute the primary path
-    path_primary = graph.shortest_path(src, dest, logger)
+    # Compute the primary path if not provided
+    if path_primary is None:
+        path_primary = graph.shortest_path(src, dest, logger)
     ports_primary = graph.flows_for_path(path_primary)
 
     # If the secondary graph not specified use the primary graph to compute the
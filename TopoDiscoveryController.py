@@ -59,6 +59,8 @@ class TopoDiscoveryController(app_manager.RyuApp):
         __ctrl_role (str): Current controller role (unknown, slave, master)
         unknown_links (dict): List of unknown links in format
             {(<src sw>, <src pn>, <dst pn>): <cid or [timeout value]>}
+        unknown_links_by_cid (dict): Reverse index of the resolved unknown links in
+            format {<cid>: set([(<src sw>, <src pn>, <dst pn>), ...])}
         __unknown_links_timer (threading.Timer): Timer instance that handles CID resolution for
             unknown links.
         __ing_change_detect_wait (dict): List of paths ingress change detection is temporary
@@ -104,6 +106,7 @@ class TopoDiscoveryController(app_manager.RyuApp):
             self.__rebuild_state_sw = {}
             self.__ctrl_role = "unknown"
             self.unknown_links = {}
+            self.unknown_links_by_cid = {}
             self.__unknown_links_timer = None
             self.__ing_change_detect_wait = {}
             self.__cleanup_handlers = []
@@ -190,6 +193,7 @@ class TopoDiscoveryController(app_manager.RyuApp):
         self.__rebuild_state_sw = {}
         self.__ctrl_role = "unknown"
         self.unknown_links = {}
+        self.unknown_links_by_cid = {}
         self.__unknown_links_timer = None
         self.__ing_change_detect_wait = {}
         self.__cleanup_handlers = []
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+# -----------------------------------------------------------------
+#
+# Unit-test which checks that the leader election keep-alive message
+# cache never advertises a regenerated (old) instance ID.
+#
+# Run using the command:
+#   python -m unittest code_leader_election_test
+#
+# -----------------------------------------------------------------
+
+import logging
+import unittest
+from threading import Thread, Lock, Event
+
+import LeaderElection
+from LeaderElection import decode_msg
+
+
+class DummyLeaderElection(LeaderElection.LeaderElection):
+    """ Leader election instance that does not connect to RabbitMQ or start
+    any threads. Sent messages are saved to `:cls:attr:(sent)`.
+    """
+    def __init__(self, inst_id):
+        self.logger = logging
+        self.channel = "test"
+        self.queue_name = "q1"
+        self._keep_alive_cache = None
+        self.ctrl_role_lock = Lock()
+        self.inst_id = inst_id
+        self.ctrl_role = "master"
+        self.sent = []
+
+    def _pika_safe_send(self, channel, obj_str):
+        self.sent.append(decode_msg(obj_str))
+
+
+class CodeTestLeaderElection(unittest.TestCase):
+    """ Unit test python class for the leader election keep-alive cache """
+
+    def setUp(self):
+        logging.basicConfig(level=100)
+        self.le = DummyLeaderElection(5)
+        self.encode_msg = LeaderElection.encode_msg
+
+
+    def tearDown(self):
+        LeaderElection.encode_msg = self.encode_msg
+
+
+    def test_keep_alive_cache(self):
+        """ Check the keep-alive is only encoded again after the instance ID changes """
+        self.le._send_inst_id()
+        self.le._send_inst_id()
+        self.assertEqual([m["inst_id"] for m in self.le.sent], [5, 5])
+
+        self.le._regenerate_inst_id()
+        self.le._send_inst_id()
+        self.assertEqual(self.le.sent[-1]["inst_id"], self.le.inst_id)
+        self.assertEqual(self.le.sent[-1]["role"], "master")
+
+
+    def test_regenerate_races_keep_alive(self):
+        """ Check that a collision triggered inst_id regeneration performed while a
+        keep-alive is being encoded does not leave the old inst_id in the cache.
+        """
+        encoding = Event()
+        regenerated = Event()
+        encode_msg = self.encode_msg
+
+        def slow_encode_msg(*args, **kwargs):
+            # Let the regeneration run while the keep-alive is being encoded
+            encoding.set()
+            regenerated.wait(0.5)
+            return encode_msg(*args, **kwargs)
+
+        def collision():
+            encoding.wait()
+            self.le._regenerate_inst_id()
+            regenerated.set()
+
+        LeaderElection.encode_msg = slow_encode_msg
+        th = Thread(target=collision)
+        th.start()
+        self.le._send_inst_id()
+        th.join()
+        LeaderElection.encode_msg = encode_msg
+
+        # The keep-alive that raced the regeneration may use the old inst_id, but
+        # all subsequent keep-alives have to advertise the new one
+        self.assertNotEqual(self.le.inst_id, 5)
+        self.le._send_inst_id()
+        self.le._send_inst_id()
+        self.assertEqual([m["inst_id"] for m in self.le.sent[1:]],
+                [self.le.inst_id, self.le.inst_id])
+
+
+if __name__ == "__main__":
+    unittest.main()
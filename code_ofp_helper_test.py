@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+# -----------------------------------------------------------------
+#
+# Unit-test which checks that the OFP_Helper match, action and
+# instruction comparators and the bundle install work correctly.
+#
+# Run using the command:
+#   python -m unittest code_ofp_helper_test
+#
+# -----------------------------------------------------------------
+
+import unittest
+
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser as parser
+from ryu.ofproto.ofproto_protocol import ProtocolDesc
+
+import OFP_Helper
+
+
+class CodeTestOFPHelper(unittest.TestCase):
+    """ Unit test python class for the OFP_Helper comparators and bundle install """
+
+
+    def _apply(self, actions):
+        """ Build an apply actions instruction list from `actions` """
+        return [parser.OFPInstructionActions(ofproto_v1_3.OFPIT_APPLY_ACTIONS,
+                    actions)]
+
+
+    def test_match_obj_eq(self):
+        """ Check match objects compare equal regardless of field order """
+        a = parser.OFPMatch(in_port=1, vlan_vid=0x1002)
+        b = parser.OFPMatch(vlan_vid=0x1002, in_port=1)
+        c = parser.OFPMatch(in_port=2, vlan_vid=0x1002)
+
+        self.assertTrue(OFP_Helper.match_obj_eq(a, b))
+        self.assertFalse(OFP_Helper.match_obj_eq(a, c))
+        self.assertFalse(OFP_Helper.match_obj_eq(a, parser.OFPMatch(in_port=1)))
+        self.assertFalse(OFP_Helper.match_obj_eq(a, None))
+        self.assertFalse(OFP_Helper.match_obj_eq(None, a))
+
+
+    def test_action_set_field(self):
+        """ Check set field actions compare by key and value and that a mismatched
+        action type returns false rather than raising an exception.
+        """
+        a = parser.OFPActionSetField(eth_dst="00:00:00:00:00:01")
+        b = parser.OFPActionSetField(eth_dst="00:00:00:00:00:01")
+        c = parser.OFPActionSetField(eth_dst="00:00:00:00:00:02")
+        d = parser.OFPActionSetField(vlan_vid=0x1002)
+
+        self.assertTrue(OFP_Helper._action_eq(a, b, parser))
+        self.assertFalse(OFP_Helper._action_eq(a, c, parser))
+        self.assertFalse(OFP_Helper._action_eq(a, d, parser))
+        self.assertFalse(OFP_Helper._action_eq(a, parser.OFPActionOutput(1), parser))
+
+
+    def test_instruction_eq(self):
+        """ Check instructions compare equal regardless of the action order """
+        a = [parser.OFPActionOutput(p) for p in range(1, 10)]
+        a.append(parser.OFPActionSetField(eth_dst="00:00:00:00:00:01"))
+        a.append(parser.OFPActionGroup(5))
+        b = list(reversed(a))
+        c = a[:-1] + [parser.OFPActionGroup(6)]
+
+        self.assertTrue(OFP_Helper.instruction_eq(self._apply(a), self._apply(b)))
+        self.assertFalse(OFP_Helper.instruction_eq(self._apply(a), self._apply(c)))
+        self.assertFalse(OFP_Helper.instruction_eq(self._apply(a), self._apply(a[:-1])))
+
+
+    def test_install_bundle(self):
+        """ Check a bundle is opened, receives the flow mods in order and is committed """
+        dp = ProtocolDesc(ofproto_v1_3.OFP_VERSION)
+        sent = []
+        dp.send_msg = sent.append
+
+        mods = [parser.OFPFlowMod(datapath=dp, match=OFP_Helper.match(dp, vlan=v),
+                    instructions=self._apply(OFP_Helper.action(dp, out_port=v)))
+                for v in range(1, 4)]
+        OFP_Helper.install_bundle(dp, mods)
+
+        self.assertEqual(len(sent), len(mods) + 2)
+        self.assertTrue(isinstance(sent[0], parser.ONFBundleCtrlMsg))
+        self.assertEqual(sent[0].type, ofproto_v1_3.ONF_BCT_OPEN_REQUEST)
+        self.assertTrue(isinstance(sent[-1], parser.ONFBundleCtrlMsg))
+        self.assertEqual(sent[-1].type, ofproto_v1_3.ONF_BCT_COMMIT_REQUEST)
+        self.assertEqual([m.message for m in sent[1:-1]], mods)
+        for msg in sent:
+            self.assertEqual(msg.bundle_id, sent[0].bundle_id)
+            self.assertEqual(msg.flags, ofproto_v1_3.ONF_BF_ATOMIC)
+            msg.serialize()
+
+
+if __name__ == "__main__":
+    unittest.main()